@@ -30,20 +30,21 @@ def main():
         print("🚀 Starting with streamlit run for you...")
         print()
         
-        # Try to launch with streamlit
+        # Hand this process over to streamlit (exec replaces the interpreter
+        # rather than keeping a parent Python alive for the whole session)
         try:
-            import subprocess
-            subprocess.run([sys.executable, "-m", "streamlit", "run", __file__])
-        except KeyboardInterrupt:
-            print("\n👋 Goodbye!")
+            sys.stdout.flush()
+            os.execvp(sys.executable, [sys.executable, "-m", "streamlit", "run", __file__])
         except Exception as e:
             print(f"❌ Error launching streamlit: {e}")
             print("Please run manually: streamlit run main.py")
         return
     
-    # Add src directory to Python path for imports
-    src_path = Path(__file__).parent / "src"
-    sys.path.insert(0, str(src_path))
+    # Add src directory to Python path for imports (once - Streamlit re-runs
+    # this script on every interaction)
+    src_path = str(Path(__file__).parent / "src")
+    if src_path not in sys.path:
+        sys.path.insert(0, src_path)
     
     try:
         from src.ui.app import main as app_main
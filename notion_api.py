@@ -1,31 +1,68 @@
 import os
+import asyncio
+import httpx
+import orjson
 from dotenv import load_dotenv
-from notion_client import Client
+from notion_client import AsyncClient
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 # Load .env into environment
 load_dotenv()
 print("Loaded NOTION_API_TOKEN:", os.getenv("NOTION_API_TOKEN"))
 print("Loaded NOTION_RECIPES_DB_ID:", os.getenv("NOTION_RECIPES_DB_ID"))
 
-app = FastAPI()
-notion = Client(auth=os.getenv("NOTION_API_TOKEN"))
+app = FastAPI(default_response_class=ORJSONResponse)
+# Concurrent block requests share one HTTP/2 connection to api.notion.com
+notion = AsyncClient(
+    auth=os.getenv("NOTION_API_TOKEN"),
+    client=httpx.AsyncClient(http2=True, limits=httpx.Limits(max_connections=10))
+)
 
-def fetch_children(block_id):
-    blocks = notion.blocks.children.list(block_id=block_id)
-    results = []
-    for block in blocks.get("results", []):
-        if block.get("has_children"):
-            block["children"] = fetch_children(block.get("id"))
-        results.append(block)
+# Max concurrent block requests per recipe (Notion averages 3 req/s)
+MAX_CONCURRENT_REQUESTS = 3
+
+# recipe_id -> (last_edited_time, block tree)
+_recipe_cache = {}
+
+async def fetch_children(block_id, semaphore):
+    async with semaphore:
+        blocks = await notion.blocks.children.list(block_id=block_id)
+    results = blocks.get("results", [])
+    # Fetch sibling subtrees concurrently
+    parents = [block for block in results if block.get("has_children")]
+    children = await asyncio.gather(*(fetch_children(block.get("id"), semaphore) for block in parents))
+    for block, block_children in zip(parents, children):
+        block["children"] = block_children
     return results
 
+async def iter_children(block_id, semaphore):
+    """Yield the top-level blocks of block_id in order, each with its subtree resolved."""
+    async with semaphore:
+        blocks = await notion.blocks.children.list(block_id=block_id)
+    results = blocks.get("results", [])
+    # Start every subtree now, but yield in document order as each one completes
+    tasks = [
+        asyncio.ensure_future(fetch_children(block.get("id"), semaphore)) if block.get("has_children") else None
+        for block in results
+    ]
+    try:
+        for block, task in zip(results, tasks):
+            if task is not None:
+                block["children"] = await task
+            yield block
+    finally:
+        # Client went away mid-stream
+        for task in tasks:
+            if task is not None and not task.done():
+                task.cancel()
+
 @app.get("/recipes")
-def list_recipes():
+async def list_recipes():
     db_id = os.getenv("NOTION_RECIPES_DB_ID")
     if not db_id:
         raise HTTPException(status_code=500, detail="Database ID not set")
-    response = notion.databases.query(database_id=db_id)
+    response = await notion.databases.query(database_id=db_id)
     recipes = []
     for page in response.get("results", []):
         props = page.get("properties", {})
@@ -35,12 +72,37 @@ def list_recipes():
     return {"recipes": recipes}
 
 @app.get("/recipes/{recipe_id}")
-def get_recipe(recipe_id: str):
+async def get_recipe(recipe_id: str):
+    """
+    Stream a recipe as NDJSON: the first line is {"id", "last_edited_time", "properties"},
+    then one line per top-level content block (with nested "children") as each resolves.
+    """
     try:
-        page = notion.pages.retrieve(page_id=recipe_id)
+        page = await notion.pages.retrieve(page_id=recipe_id)
     except Exception:
         raise HTTPException(status_code=404, detail="Recipe not found")
     props = page.get("properties", {})
     filtered = {name: prop for name, prop in props.items() if prop.get("type") != "rollup"}
-    content = fetch_children(recipe_id)
-    return {"id": recipe_id, "properties": filtered, "content": content} 
\ No newline at end of file
+    # Unchanged pages reuse the cached block tree instead of re-walking it
+    last_edited = page.get("last_edited_time")
+    cached_edit, cached_content = _recipe_cache.get(recipe_id, (None, None))
+
+    async def ndjson_lines():
+        yield orjson.dumps(
+            {"id": recipe_id, "last_edited_time": last_edited, "properties": filtered}
+        ) + b"\n"
+        if last_edited is not None and cached_edit == last_edited:
+            for block in cached_content:
+                yield orjson.dumps(block) + b"\n"
+            return
+        content = []
+        async for block in iter_children(recipe_id, asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)):
+            content.append(block)
+            yield orjson.dumps(block) + b"\n"
+        _recipe_cache[recipe_id] = (last_edited, content)
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    ) 
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .llm_client import LLMClient
+from .response_cache import ResponseCache
 
-__all__ = ["LLMClient"] 
\ No newline at end of file
+__all__ = ["LLMClient", "ResponseCache"] 
\ No newline at end of file
@@ -3,48 +3,98 @@ LLM client for interacting with OpenAI's chat completion API.
 Supports both normal and sassy modes with different prompts and parameters.
 """
 import os
+import re
+import hashlib
+import random
+import asyncio
+import httpx
+import numpy as np
 import openai
-from typing import Iterator, List, Dict, Optional
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 
-from ..config import get_system_prompt
+from ..config import get_system_prompt, load_env
+from ..config.prompts import BREVITY_INSTRUCTION
+from .response_cache import ResponseCache
 
-load_dotenv()
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Transient API failures worth retrying, with full-jitter exponential backoff
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError
+)
+MAX_ATTEMPTS = 4
+RETRY_MIN_WAIT = 0.5
+RETRY_MAX_WAIT = 8.0
+
+# Answers to a batched prompt are each prefixed with "### Q<n>:"
+BATCH_ANSWER_SPLIT = re.compile(r"^### Q\d+:\s*", flags=re.M)
+
+
+@dataclass(frozen=True)
+class ModeConfig:
+    """Generation parameters and fallback message for one chef mode."""
+    max_tokens: int
+    temperature: float
+    error_message: str
 
 
 class LLMClient:
     """
     OpenAI ChatCompletion client with support for different modes and streaming.
+
+    All network calls are async (``openai.AsyncOpenAI``) so independent questions
+    can be overlapped with ``ask_many`` instead of waiting on each round-trip.
     """
 
     def __init__(
         self,
-        model: str = "gpt-4o",
+        model: str = "gpt-4o-mini",
         max_tokens: int = 150,
         temperature: float = 0.2,
         sassy_max_tokens: int = 100,
         sassy_temperature: float = 0.7,
         gordon_max_tokens: int = 120,
-        gordon_temperature: float = 0.8
+        gordon_temperature: float = 0.8,
+        max_concurrency: int = 8,
+        cache_size: int = 256,
+        semantic_cache: bool = False,
+        max_history_turns: int = 10
     ):
         """
         Initialize LLM client.
         
         Args:
-            model: OpenAI model to use
+            model: OpenAI model to use. gpt-4o-mini answers short cooking questions
+                2-4x faster than gpt-4o; pass gpt-4o explicitly for harder reasoning.
             max_tokens: Maximum tokens for normal mode
             temperature: Temperature for normal mode
             sassy_max_tokens: Maximum tokens for sassy mode
             sassy_temperature: Temperature for sassy mode (higher for more creativity)
             gordon_max_tokens: Maximum tokens for Gordon Ramsay mode
             gordon_temperature: Temperature for Gordon Ramsay mode (highest for most explosive responses)
+            max_concurrency: Maximum number of in-flight requests for ask_many
+            cache_size: Maximum cached answers for repeated questions (0 disables)
+            semantic_cache: Also match near-duplicate questions by embedding similarity
+            max_history_turns: Question/answer pairs kept in a conversation history
+                after the system + recipe prefix (0 keeps everything)
         """
         # Validate API key
+        load_env()
         api_key = os.environ.get("OPENAI_API_KEY", "").strip()
         if not api_key:
             raise EnvironmentError("Please set OPENAI_API_KEY in environment")
         
-        openai.api_key = api_key
+        # One HTTP/2 connection pool shared by every request from this client
+        self._http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        )
+        # Retries are handled by _create_completion so Retry-After is honoured once
+        self._client = openai.AsyncOpenAI(api_key=api_key, http_client=self._http, max_retries=0)
         
         # Model parameters
         self.model = model
@@ -54,13 +104,70 @@ class LLMClient:
         self.sassy_temperature = sassy_temperature
         self.gordon_max_tokens = gordon_max_tokens
         self.gordon_temperature = gordon_temperature
+        self.max_concurrency = max_concurrency
+        self.max_history_turns = max_history_turns
+        
+        # Per-mode parameters, resolved once so requests just index by mode
+        self._modes: Dict[str, ModeConfig] = {
+            "normal": ModeConfig(
+                max_tokens, temperature,
+                "Sorry, I'm having trouble right now."
+            ),
+            "sassy": ModeConfig(
+                sassy_max_tokens, sassy_temperature,
+                "Great, now I'm broken too. Try again, genius."
+            ),
+            "gordon_ramsay": ModeConfig(
+                gordon_max_tokens, gordon_temperature,
+                "BLOODY HELL! The system's gone down! Come back when the tech's been sorted!"
+            )
+        }
+        
+        # Answer cache for stateless questions
+        self.response_cache = ResponseCache(cache_size) if cache_size > 0 else None
+        self.semantic_cache = semantic_cache
+        
+        # Session prefix set by bind_recipe
+        self.frozen_prefix: Tuple[Dict, ...] = ()
+        self._bound_recipe: Optional[str] = None
+        self._bound_mode: Optional[str] = None
+        # Routes requests sharing the bound prefix to the same OpenAI prompt cache
+        self.prompt_cache_key: Optional[str] = None
+
+    def bind_recipe(self, recipe_text: str, chef_mode: str = "normal") -> Tuple[Dict, ...]:
+        """
+        Build the system prompt + recipe messages once for a session.
+        
+        Stateless calls for the same recipe and mode reuse these messages, and
+        conversations can start from them, so the prompt prefix is identical
+        on every request. Requests are tagged with a prompt_cache_key derived
+        from the prefix, so OpenAI serves the cached system + recipe tokens
+        instead of processing them again each turn.
+        
+        Args:
+            recipe_text: The recipe context
+            chef_mode: Chef personality mode - "normal", "sassy", or "gordon_ramsay"
+            
+        Returns:
+            The frozen (system, recipe) message tuple
+        """
+        self.frozen_prefix = (
+            {"role": "system", "content": get_system_prompt(chef_mode=chef_mode)},
+            {"role": "user", "content": f"Here is my recipe:\n{recipe_text}"}
+        )
+        self._bound_recipe = recipe_text
+        self._bound_mode = chef_mode
+        prefix_id = f"{self.model}|{chef_mode}|{recipe_text}".encode()
+        self.prompt_cache_key = f"hey-chef-{hashlib.sha256(prefix_id).hexdigest()[:32]}"
+        return self.frozen_prefix
 
-    def ask(
+    async def ask(
         self,
         recipe_text: str,
         user_question: str,
         history: Optional[List[Dict]] = None,
-        chef_mode: str = "normal"
+        chef_mode: str = "normal",
+        verbosity: str = "concise"
     ) -> str:
         """
         Get a complete response from the LLM.
@@ -70,34 +177,149 @@ class LLMClient:
             user_question: User's question
             history: Conversation history (if maintaining context)
             chef_mode: Chef personality mode - "normal", "sassy", or "gordon_ramsay"
+            verbosity: "concise" to ask for short spoken answers, "detailed" otherwise
             
         Returns:
             Complete assistant response
         """
-        messages = self._build_messages(recipe_text, user_question, history, chef_mode)
+        # Answers depend on the conversation, so only stateless asks are cached
+        use_cache = history is None and self.response_cache is not None
+        if use_cache:
+            key = ResponseCache.make_key(
+                recipe_text, user_question.strip().lower(), chef_mode, verbosity
+            )
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            scope, embedding = None, None
+            if self.semantic_cache:
+                scope = ResponseCache.make_key(recipe_text, chef_mode, verbosity)
+                embedding = await self._embed(user_question)
+                if embedding is not None:
+                    cached = self.response_cache.get_similar(scope, embedding)
+                    if cached is not None:
+                        return cached
+        
+        messages = self._build_messages(
+            recipe_text, user_question, history, chef_mode, verbosity
+        )
         
         # Choose parameters based on mode
-        max_tokens, temperature = self._get_mode_parameters(chef_mode)
+        mode = self._get_mode(chef_mode)
         
         try:
-            response = openai.chat.completions.create(
+            response = await self._create_completion(
                 model=self.model,
                 messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
+                temperature=mode.temperature,
+                max_tokens=mode.max_tokens
             )
-            return response.choices[0].message.content.strip()
+            answer = response.choices[0].message.content.strip()
         except Exception as e:
             print(f"⚠️ LLM request failed: {e}")
-            return self._get_error_message(chef_mode)
+            return mode.error_message
+        
+        if use_cache:
+            self.response_cache.put(key, answer, scope, embedding)
+        return answer
+
+    async def _embed(self, text: str):
+        """Get a unit-length embedding of text, or None if unavailable."""
+        try:
+            response = await self._client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        except Exception as e:
+            print(f"⚠️ Embedding request failed: {e}")
+            return None
+        
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    async def ask_many(
+        self,
+        items: List[Tuple[str, str]],
+        chef_mode: str = "normal"
+    ) -> List[str]:
+        """
+        Ask several independent questions concurrently.
+        
+        Args:
+            items: (recipe_text, user_question) pairs
+            chef_mode: Chef personality mode - "normal", "sassy", or "gordon_ramsay"
+            
+        Returns:
+            Responses in the same order as items
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded_ask(recipe_text: str, user_question: str) -> str:
+            async with semaphore:
+                return await self.ask(recipe_text, user_question, chef_mode=chef_mode)
+
+        return list(await asyncio.gather(
+            *(_bounded_ask(recipe_text, question) for recipe_text, question in items)
+        ))
+
+    async def ask_batch(
+        self,
+        recipe_text: str,
+        questions: List[str],
+        chef_mode: str = "normal"
+    ) -> List[str]:
+        """
+        Answer several questions about one recipe in a single API call.
+        
+        The recipe and system prompt are sent once rather than once per
+        question, and the reply is split back into per-question answers.
+        
+        Args:
+            recipe_text: The recipe context
+            questions: User questions to answer
+            chef_mode: Chef personality mode - "normal", "sassy", or "gordon_ramsay"
+            
+        Returns:
+            Answers in the same order as questions
+        """
+        if not questions:
+            return []
+        
+        numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, start=1))
+        batch_question = (
+            "Answer each question concisely, prefix each answer with '### Q<i>:'. "
+            f"Questions:\n{numbered}"
+        )
+        messages = self._build_messages(recipe_text, batch_question, None, chef_mode)
+        
+        # Keep the per-question token budget
+        mode = self._get_mode(chef_mode)
+        
+        try:
+            response = await self._create_completion(
+                model=self.model,
+                messages=messages,
+                temperature=mode.temperature,
+                max_tokens=mode.max_tokens * len(questions)
+            )
+            reply = response.choices[0].message.content
+        except Exception as e:
+            print(f"⚠️ LLM batch request failed: {e}")
+            return [mode.error_message] * len(questions)
+        
+        # Anything before the first marker is preamble
+        answers = [a.strip() for a in BATCH_ANSWER_SPLIT.split(reply)[1:]]
+        if len(answers) < len(questions):
+            print(f"⚠️ LLM batch reply had {len(answers)} of {len(questions)} answers")
+            answers += [mode.error_message] * (len(questions) - len(answers))
+        return answers[:len(questions)]
 
-    def stream(
+    async def stream(
         self,
         recipe_text: str,
         user_question: str,
         history: Optional[List[Dict]] = None,
-        chef_mode: str = "normal"
-    ) -> Iterator[str]:
+        chef_mode: str = "normal",
+        verbosity: str = "concise"
+    ) -> AsyncIterator[str]:
         """
         Stream response chunks from the LLM.
         
@@ -106,57 +328,80 @@ class LLMClient:
             user_question: User's question
             history: Conversation history (if maintaining context)
             chef_mode: Chef personality mode - "normal", "sassy", or "gordon_ramsay"
+            verbosity: "concise" to ask for short spoken answers, "detailed" otherwise
             
         Yields:
             Text chunks as they arrive
         """
-        messages = self._build_messages(recipe_text, user_question, history, chef_mode)
+        messages = self._build_messages(
+            recipe_text, user_question, history, chef_mode, verbosity
+        )
         
         # Choose parameters based on mode
-        max_tokens, temperature = self._get_mode_parameters(chef_mode)
+        mode = self._get_mode(chef_mode)
         
         try:
-            stream = openai.chat.completions.create(
+            stream = await self._create_completion(
                 model=self.model,
                 messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
+                temperature=mode.temperature,
+                max_tokens=mode.max_tokens,
                 stream=True
             )
             
-            for chunk in stream:
+            async for chunk in stream:
                 delta = chunk.choices[0].delta.content
                 if delta:
                     yield delta
                     
         except Exception as e:
             print(f"⚠️ LLM streaming failed: {e}")
-            yield self._get_error_message(chef_mode)
-
-    def _get_mode_parameters(self, chef_mode: str) -> tuple[int, float]:
-        """Get max_tokens and temperature for the specified chef mode."""
-        if chef_mode == "sassy":
-            return self.sassy_max_tokens, self.sassy_temperature
-        elif chef_mode == "gordon_ramsay":
-            return self.gordon_max_tokens, self.gordon_temperature
-        else:
-            return self.max_tokens, self.temperature
-
-    def _get_error_message(self, chef_mode: str) -> str:
-        """Get an appropriate error message for the chef mode."""
-        if chef_mode == "sassy":
-            return "Great, now I'm broken too. Try again, genius."
-        elif chef_mode == "gordon_ramsay":
-            return "BLOODY HELL! The system's gone down! Come back when the tech's been sorted!"
-        else:
-            return "Sorry, I'm having trouble right now."
+            yield mode.error_message
+
+    async def _create_completion(self, **kwargs):
+        """Create a chat completion, retrying transient errors with backoff and jitter."""
+        if self.prompt_cache_key:
+            kwargs.setdefault("extra_body", {})["prompt_cache_key"] = self.prompt_cache_key
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                return await self._client.chat.completions.create(**kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                delay = self._get_retry_after(e)
+                if delay is None:
+                    backoff = min(RETRY_MAX_WAIT, RETRY_MIN_WAIT * 2 ** attempt)
+                    delay = max(RETRY_MIN_WAIT, random.uniform(0, backoff))
+                print(f"⚠️ LLM request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> Optional[float]:
+        """Get the server's Retry-After delay in seconds, if it sent one."""
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        try:
+            return min(RETRY_MAX_WAIT, float(response.headers.get("retry-after", "")))
+        except ValueError:
+            return None
+
+    async def aclose(self):
+        """Close the underlying HTTP connection pool."""
+        await self._client.close()
+        await self._http.aclose()
+
+    def _get_mode(self, chef_mode: str) -> ModeConfig:
+        """Get the configuration for a chef mode (unknown modes act as normal)."""
+        return self._modes.get(chef_mode) or self._modes["normal"]
 
     def _build_messages(
         self,
         recipe_text: str,
         user_question: str,
         history: Optional[List[Dict]] = None,
-        chef_mode: str = "normal"
+        chef_mode: str = "normal",
+        verbosity: str = "detailed"
     ) -> List[Dict]:
         """
         Build the message array for the API call.
@@ -164,27 +409,31 @@ class LLMClient:
         Args:
             recipe_text: The recipe context
             user_question: User's question
-            history: Conversation history
+            history: Conversation history, owned by the caller and extended in place
             chef_mode: Chef personality mode - "normal", "sassy", or "gordon_ramsay"
+            verbosity: "concise" appends a brevity instruction to the question
             
         Returns:
-            List of message dictionaries
+            List of message dictionaries (history itself when given)
         """
         # Get appropriate system prompt
         system_prompt = get_system_prompt(chef_mode=chef_mode)
         
+        # Brevity goes with the question so the cached system prefix is unchanged
+        if verbosity == "concise":
+            user_question = f"{user_question}\n\n{BREVITY_INSTRUCTION}"
+        
         if history:
-            # Using conversation history - append new user message
-            messages = history.copy()
+            # Using conversation history - append the new user message in place
+            # rather than copying the whole list every turn
+            messages = history
+            self._apply_mode_prompt(messages, system_prompt)
             messages.append({"role": "user", "content": user_question})
-            
-            # Update system prompt if it's different (mode changed)
-            if messages[0]["role"] == "system":
-                messages[0]["content"] = system_prompt
-            else:
-                # Insert system prompt at beginning
-                messages.insert(0, {"role": "system", "content": system_prompt})
                 
+        elif recipe_text == self._bound_recipe and chef_mode == self._bound_mode:
+            # No history - reuse the session prefix from bind_recipe
+            messages = [*self.frozen_prefix, {"role": "user", "content": user_question}]
+        
         else:
             # No history - create fresh conversation
             messages = [
@@ -215,17 +464,55 @@ class LLMClient:
             Updated history
         """
         if history:
+            # Record any mode switch before the response it produced
+            self._apply_mode_prompt(history, get_system_prompt(chef_mode=chef_mode))
             history.append({"role": "assistant", "content": response})
-            
-            # Ensure system prompt matches current mode
-            system_prompt = get_system_prompt(chef_mode=chef_mode)
-            if history[0]["role"] == "system":
-                history[0]["content"] = system_prompt
+            self._trim_history(history)
         
         return history
 
+    def _trim_history(self, history: List[Dict]):
+        """
+        Drop the oldest turns beyond max_history_turns, in place.
+        
+        The system + recipe prefix is pinned, and so are later system messages,
+        so the active chef mode is never lost.
+        """
+        if not self.max_history_turns:
+            return
+        
+        # Prefix runs up to and including the first user message (the recipe)
+        start = next((i + 1 for i, m in enumerate(history) if m["role"] == "user"), len(history))
+        excess = sum(m["role"] != "system" for m in history[start:]) - 2 * self.max_history_turns
+        if excess <= 0:
+            return
+        
+        kept = []
+        for message in history[start:]:
+            if excess > 0 and message["role"] != "system":
+                excess -= 1
+            else:
+                kept.append(message)
+        history[start:] = kept
+
+    def _apply_mode_prompt(self, messages: List[Dict], system_prompt: str):
+        """
+        Make system_prompt the active system message without touching the prefix.
+        
+        OpenAI's prompt cache only applies to a byte-identical prefix, so the
+        leading system message is never rewritten; a mode change is appended
+        as a later system message instead.
+        """
+        if messages[0]["role"] != "system":
+            messages.insert(0, {"role": "system", "content": system_prompt})
+            return
+        
+        active_prompt = next(m["content"] for m in reversed(messages) if m["role"] == "system")
+        if active_prompt != system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
     # Legacy methods for backward compatibility
-    def ask_legacy(
+    async def ask_legacy(
         self,
         recipe_text: str,
         user_question: str,
@@ -234,7 +521,7 @@ class LLMClient:
     ) -> str:
         """Legacy method for backward compatibility."""
         chef_mode = "sassy" if sassy_mode else "normal"
-        return self.ask(recipe_text, user_question, history, chef_mode)
+        return await self.ask(recipe_text, user_question, history, chef_mode)
 
     def stream_legacy(
         self,
@@ -242,7 +529,7 @@ class LLMClient:
         user_question: str,
         history: Optional[List[Dict]] = None,
         sassy_mode: bool = False
-    ) -> Iterator[str]:
+    ) -> AsyncIterator[str]:
         """Legacy method for backward compatibility."""
         chef_mode = "sassy" if sassy_mode else "normal"
         return self.stream(recipe_text, user_question, history, chef_mode) 
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Local cache of LLM answers for repeated cooking questions.
+Supports exact-match lookup plus optional embedding-similarity lookup.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of assistant answers.
+
+    Exact matches are keyed by a blake2b digest of the request. Near-duplicate
+    questions can also be matched by cosine similarity of unit-length question
+    embeddings, scoped so answers never cross recipes or chef modes.
+    """
+
+    def __init__(self, max_entries: int = 256, similarity_threshold: float = 0.95):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._answers: "OrderedDict[bytes, str]" = OrderedDict()
+        self._embeddings: Dict[bytes, List[Tuple[Any, bytes]]] = {}
+
+    @staticmethod
+    def make_key(*parts: str) -> bytes:
+        """Build a compact cache key from request parts."""
+        return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Get an exact-match answer, or None on a miss."""
+        answer = self._answers.get(key)
+        if answer is not None:
+            self._answers.move_to_end(key)
+        return answer
+
+    def get_similar(self, scope: bytes, embedding: Any) -> Optional[str]:
+        """
+        Get the answer to the most similar cached question within a scope.
+
+        Args:
+            scope: Key grouping comparable questions (recipe + chef mode)
+            embedding: Unit-length embedding of the new question
+
+        Returns:
+            Cached answer if the best match clears the threshold, else None
+        """
+        best_score, best_key = 0.0, None
+        for vector, key in self._embeddings.get(scope, ()):
+            score = float(vector @ embedding)
+            if score > best_score:
+                best_score, best_key = score, key
+
+        if best_key is None or best_score < self.similarity_threshold:
+            return None
+        return self.get(best_key)
+
+    def put(
+        self,
+        key: bytes,
+        answer: str,
+        scope: Optional[bytes] = None,
+        embedding: Any = None
+    ):
+        """
+        Store an answer, evicting the least recently used one when full.
+
+        Args:
+            key: Exact-match key from make_key
+            answer: Assistant answer to cache
+            scope: Scope for semantic lookup (only used with embedding)
+            embedding: Unit-length embedding of the question
+        """
+        self._answers[key] = answer
+        self._answers.move_to_end(key)
+        while len(self._answers) > self.max_entries:
+            self._answers.popitem(last=False)
+
+        if scope is not None and embedding is not None:
+            entries = self._embeddings.setdefault(scope, [])
+            entries.append((embedding, key))
+            # Evicted answers leave stale entries; keep the list bounded too
+            del entries[:-self.max_entries]
+
+    def clear(self):
+        """Drop all cached answers."""
+        self._answers.clear()
+        self._embeddings.clear()
@@ -1,5 +1,6 @@
+from .audio_manager import AudioInput, get_shared_input
 from .wake_word import WakeWordDetector
 from .speech_to_text import WhisperSTT  
 from .text_to_speech import TTSEngine
 
-__all__ = ["WakeWordDetector", "WhisperSTT", "TTSEngine"] 
\ No newline at end of file
+__all__ = ["AudioInput", "get_shared_input", "WakeWordDetector", "WhisperSTT", "TTSEngine"] 
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Shared microphone input for wake-word detection and speech-to-text.
+"""
+import queue
+import threading
+import numpy as np
+import sounddevice as sd
+from typing import Optional, Tuple
+
+# Wake word and Whisper both consume 16 kHz mono int16
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 512
+
+# Seconds of audio buffered per reader before new blocks are dropped
+READER_BUFFER_SEC = 3.0
+
+
+class FrameReader:
+    """
+    One consumer's view of the shared microphone stream.
+    
+    Captured blocks are copied into a preallocated int16 ring buffer and read
+    back as frames of a fixed size, so steady-state capture allocates nothing.
+    """
+
+    def __init__(self, frame_size: int, capacity: int):
+        """
+        Initialize reader.
+
+        Args:
+            frame_size: Number of samples returned by each read()
+            capacity: Ring buffer size in samples
+        """
+        self.frame_size = frame_size
+        self._ring = np.zeros(capacity, dtype=np.int16)
+        self._frame = np.empty(frame_size, dtype=np.int16)
+        # Total samples written/read; positions in the ring are taken modulo capacity
+        self._written = 0
+        self._read = 0
+        self._cond = threading.Condition()
+
+    def _copy_in(self, block: np.ndarray):
+        """Append a captured block to the ring (called from the audio callback)."""
+        n = len(block)
+        capacity = len(self._ring)
+        with self._cond:
+            if self._written - self._read + n > capacity:
+                return  # Reader is idle and the ring is full; drop the block
+            start = self._written % capacity
+            first = min(n, capacity - start)
+            self._ring[start:start + first] = block[:first]
+            self._ring[:n - first] = block[first:]
+            self._written += n
+            self._cond.notify()
+
+    def read(self, timeout: Optional[float] = 1.0) -> np.ndarray:
+        """
+        Get the next frame of frame_size int16 samples.
+
+        Returns:
+            A reused buffer, only valid until the next read()
+
+        Raises:
+            queue.Empty: If no audio arrives within timeout
+        """
+        n = self.frame_size
+        capacity = len(self._ring)
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._written - self._read >= n, timeout):
+                raise queue.Empty
+            start = self._read % capacity
+            first = min(n, capacity - start)
+            self._frame[:first] = self._ring[start:start + first]
+            self._frame[first:] = self._ring[:n - first]
+            self._read += n
+        return self._frame
+
+    def clear(self):
+        """Discard audio captured before now."""
+        with self._cond:
+            self._read = self._written
+
+
+class AudioInput:
+    """
+    Single long-lived PortAudio input stream broadcast to any number of readers,
+    so switching from wake-word detection to recording never reopens the device.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, block_size: int = BLOCK_SIZE):
+        """
+        Initialize shared input (the stream opens on start()).
+
+        Args:
+            sample_rate: Capture sample rate
+            block_size: Samples per PortAudio callback
+        """
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.stream: Optional[sd.InputStream] = None
+        self._readers: Tuple[FrameReader, ...] = ()
+        self._lock = threading.Lock()
+        # Outstanding start() calls; the stream closes when the last one is stopped
+        self._users = 0
+
+    def start(self):
+        """
+        Open the input stream if needed and hold it open until a matching stop().
+        
+        Raises:
+            RuntimeError: If the stream cannot be opened
+        """
+        with self._lock:
+            self._open()
+            self._users += 1
+
+    def stop(self):
+        """Release one start(); the stream closes once no user holds it open."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0:
+                self._close()
+
+    def _open(self):
+        """Open and start the input stream if not already running (lock held)."""
+        if self.stream is not None:
+            return
+        try:
+            self.stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                blocksize=self.block_size,
+                dtype="int16",
+                channels=1,
+                callback=self._callback
+            )
+            self.stream.start()
+        except Exception as e:
+            self.stream = None
+            raise RuntimeError(f"Failed to open audio stream: {e}")
+
+    def _close(self):
+        """Stop and close the input stream (lock held)."""
+        if self.stream:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+
+    def subscribe(self, frame_size: int) -> FrameReader:
+        """
+        Create a reader receiving every captured block, opening the stream if needed.
+        
+        Subscribing does not hold the stream open: it stays open only while
+        start() calls are outstanding, or until the first stop().
+        """
+        capacity = max(int(self.sample_rate * READER_BUFFER_SEC), frame_size + self.block_size)
+        reader = FrameReader(frame_size, capacity)
+        with self._lock:
+            self._readers = self._readers + (reader,)
+            self._open()
+        return reader
+
+    def unsubscribe(self, reader: FrameReader):
+        """Stop delivering audio to a reader."""
+        with self._lock:
+            self._readers = tuple(r for r in self._readers if r is not reader)
+
+    def _callback(self, indata: np.ndarray, frames: int, time, status):
+        """PortAudio callback: copy the captured block into each reader's ring."""
+        block = indata[:, 0]
+        for reader in self._readers:
+            reader._copy_in(block)
+
+
+_shared_input: Optional[AudioInput] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_input() -> AudioInput:
+    """Get the process-wide 16 kHz microphone input."""
+    global _shared_input
+    with _shared_lock:
+        if _shared_input is None:
+            _shared_input = AudioInput()
+        return _shared_input
@@ -1,13 +1,28 @@
 """
-Speech-to-text using OpenAI Whisper with voice activity detection.
+Speech-to-text using Whisper (faster-whisper int8) with voice activity detection.
 """
 import os
-import wave
+import threading
+from collections import deque
+import numpy as np
 import webrtcvad
-import sounddevice as sd
-from tempfile import NamedTemporaryFile
-from typing import Optional
-import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Optional
+
+from .audio_manager import AudioInput, FrameReader, get_shared_input
+
+# Energy gate: before speech starts, frames below MARGIN x the calibrated noise floor
+# count as silence without running the VAD; once recording, only frames below the
+# floor itself do, so quiet speech is still left to the VAD.
+# The floor is a rolling average of non-speech frames, relearned for every recording
+# after skipping the first ENERGY_SETTLE_MS (the wake tone is still playing then)
+ENERGY_CALIBRATION_FRAMES = 10
+ENERGY_GATE_MARGIN = 2.0
+ENERGY_SETTLE_MS = 200
+
+# Streaming decode: a pause this long mid-utterance sends the audio so far to Whisper
+STREAM_PAUSE_MS = 300
+STREAM_MIN_SEGMENT_SEC = 1.0
 
 
 class WhisperSTT:
@@ -20,7 +35,15 @@ class WhisperSTT:
         model_size: str = "tiny",
         aggressiveness: int = 2,
         max_silence_sec: float = 0.5,
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        openvino_model_dir: Optional[str] = None,
+        openvino_device: str = "CPU",
+        max_record_sec: float = 30.0,
+        audio_input: Optional[AudioInput] = None,
+        beam_size: int = 1,
+        vad_filter: bool = True,
+        language: Optional[str] = "en",
+        compute_type: str = "int8"
     ):
         """
         Initialize speech-to-text engine.
@@ -30,172 +53,370 @@ class WhisperSTT:
             aggressiveness: VAD aggressiveness (0-3, higher = more aggressive)
             max_silence_sec: Seconds of silence before stopping recording
             sample_rate: Audio sample rate
+            openvino_model_dir: Directory of a Whisper model exported to OpenVINO.
+                Used instead of faster-whisper when present and openvino-genai is installed.
+            openvino_device: OpenVINO device for the exported model ("CPU", "GPU", "NPU")
+            max_record_sec: Longest utterance kept; recording stops when it is reached
+            audio_input: Microphone input to read from (defaults to the shared one)
+            beam_size: Whisper beam width (1 = greedy decoding)
+            vad_filter: Let faster-whisper drop silent stretches before decoding
+            language: Spoken language code; None to auto-detect
+            compute_type: CTranslate2 weight/compute precision ("int8", "int8_float32", "float32")
         """
         self.sample_rate = sample_rate
+        self.beam_size = beam_size
+        self.vad_filter = vad_filter
+        self.language = language or None
+        self.compute_type = compute_type
         self.frame_duration_ms = 30  # 10, 20, or 30 ms supported by WebRTC VAD
         self.frame_size = int(self.sample_rate * self.frame_duration_ms / 1000)
         
         # VAD setup
         self.vad = webrtcvad.Vad(aggressiveness)
         self.max_silence_frames = int((max_silence_sec * 1000) / self.frame_duration_ms)
+        # Bit i of the VAD history is the decision i frames ago; recording stops
+        # once the last max_silence_frames + 1 frames are all silent
+        self._silence_window = (1 << (self.max_silence_frames + 1)) - 1
+        self._pause_window = (1 << (STREAM_PAUSE_MS // self.frame_duration_ms)) - 1
+        self._noise_floor: Optional[float] = None
+        self._noise_energies: Deque[float] = deque(maxlen=ENERGY_CALIBRATION_FRAMES)
+        self._settle_frames = -(-ENERGY_SETTLE_MS // self.frame_duration_ms)
+        
+        # Frames from the shared microphone stream (subscribed on first recording)
+        self.audio_input = audio_input or get_shared_input()
+        if self.audio_input.sample_rate != self.sample_rate:
+            raise ValueError(
+                f"Sample rate {self.sample_rate} Hz does not match microphone "
+                f"input ({self.audio_input.sample_rate} Hz)"
+            )
+        self.reader: Optional[FrameReader] = None
         
-        # Audio stream (lazy initialization)
-        self.stream: Optional[sd.RawInputStream] = None
+        # Preallocated capture buffer reused for every utterance
+        self._buf = np.empty(int(self.sample_rate * max_record_sec), dtype=np.int16)
+        self._pos = 0
         
-        # Load Whisper model
-        self._load_whisper_model(model_size)
+        # Single worker so segments decode in order while recording continues
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+        # Serializes use of the capture buffer when one instance is shared between sessions
+        self._capture_lock = threading.Lock()
+        
+        # Whisper model is loaded on first transcription (or by preload())
+        self.model = None
+        self.backend = "whisper"
+        self._model_size = model_size
+        self._openvino_model_dir = openvino_model_dir
+        self._openvino_device = openvino_device
+        self._model_lock = threading.Lock()
+
+    def load_model(self):
+        """Load the Whisper model if needed, preferring a pre-converted OpenVINO export."""
+        with self._model_lock:
+            if self.model is not None:
+                return
+            if self._openvino_model_dir and os.path.isdir(self._openvino_model_dir):
+                self._load_openvino_pipeline(self._openvino_model_dir, self._openvino_device)
+            if self.model is None:
+                self._load_whisper_model(self._model_size)
+
+    def preload(self):
+        """Start loading and warming up the model in the background so it overlaps other work."""
+        def _load():
+            try:
+                self.warm_up()
+            except Exception as e:
+                # Retried (and raised) on first transcription
+                print(f"⚠️ Background Whisper load failed: {e}")
+        
+        threading.Thread(target=_load, name="whisper-load", daemon=True).start()
+
+    def warm_up(self):
+        """Load the model and decode a second of silence so first-call setup is already paid."""
+        self.load_model()
+        silence = np.zeros(self.sample_rate, dtype=np.float32)
+        if self.backend == "openvino":
+            self.model.generate(silence.tolist())
+        else:
+            # No VAD filter here, or the silence would be skipped without decoding
+            segments, _ = self.model.transcribe(silence, beam_size=self.beam_size, language=self.language)
+            list(segments)  # Decoding happens as segments are iterated
+
+    def _load_openvino_pipeline(self, model_dir: str, device: str):
+        """Load an OpenVINO Whisper export, caching the compiled model on disk."""
+        try:
+            import openvino_genai
+        except ImportError:
+            print("⚠️ openvino-genai not installed, falling back to faster-whisper")
+            return
+        
+        print(f"Loading OpenVINO Whisper model from '{model_dir}' on {device}...")
+        try:
+            # CACHE_DIR persists the compiled blob so later loads skip compilation
+            self.model = openvino_genai.WhisperPipeline(
+                model_dir, device, CACHE_DIR=os.path.join(model_dir, "ov_cache")
+            )
+            self.backend = "openvino"
+            print("Model loaded successfully.")
+        except Exception as e:
+            print(f"⚠️ Failed to load OpenVINO model, falling back to faster-whisper: {e}")
 
     def _load_whisper_model(self, model_size: str):
-        """Load Whisper model with error handling."""
+        """Load faster-whisper (CTranslate2) model at the configured compute_type."""
         print(f"Loading Whisper '{model_size}' model...")
         try:
-            import whisper
-            self.model = whisper.load_model(model_size)
-            print("Model loaded successfully.")
-        except urllib.error.URLError as e:
-            raise RuntimeError(
-                f"Failed to download Whisper model weights. "
-                f"Please ensure internet access or pre-download: "
-                f"`whisper --download-model {model_size}`"
-            ) from e
+            from faster_whisper import WhisperModel
         except ImportError:
             raise RuntimeError(
-                "Whisper not installed. Install with: pip install openai-whisper"
+                "faster-whisper not installed. Install with: pip install faster-whisper"
             )
+        try:
+            # int8 CTranslate2 kernels run several times faster than FP32 PyTorch on CPU
+            self.model = WhisperModel(
+                model_size,
+                device="cpu",
+                compute_type=self.compute_type,
+                cpu_threads=os.cpu_count() or 0
+            )
+            print("Model loaded successfully.")
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to load Whisper model weights (downloaded from Hugging Face Hub "
+                f"on first use - check internet access): {e}"
+            ) from e
 
     def _open_stream(self):
-        """Open audio input stream if not already open."""
-        if self.stream is None:
-            try:
-                self.stream = sd.RawInputStream(
-                    samplerate=self.sample_rate,
-                    blocksize=self.frame_size,
-                    dtype="int16",
-                    channels=1
-                )
-                self.stream.start()
-            except Exception as e:
-                raise RuntimeError(f"Failed to open audio stream: {e}")
+        """Subscribe to the shared microphone stream if not already subscribed."""
+        if self.reader is None:
+            self.reader = self.audio_input.subscribe(self.frame_size)
 
-    def _read_frame(self) -> Optional[bytes]:
-        """Read one audio frame from the stream."""
+    def _read_frame(self) -> Optional[np.ndarray]:
+        """
+        Read one audio frame into the capture buffer at the current position.
+        
+        Returns:
+            View of the frame's slot in the buffer. It only becomes part of the
+            recording once the caller advances self._pos past it.
+        """
         try:
-            data, _ = self.stream.read(self.frame_size)
-            return data.tobytes() if hasattr(data, "tobytes") else bytes(data)
+            data = self.reader.read(timeout=1.0)
+            frame = self._buf[self._pos:self._pos + self.frame_size]
+            frame[:] = data
+            return frame
         except Exception as e:
             print(f"⚠️ Error reading audio frame: {e}")
             return None
 
-    def record_until_silence(self) -> str:
+    @staticmethod
+    def _frame_energy(frame: np.ndarray) -> float:
+        """Mean absolute amplitude of an int16 frame (widened to avoid overflow)."""
+        return float(np.abs(frame, dtype=np.int32).mean())
+
+    def _is_quiet(self, frame: np.ndarray, margin: float = 1.0) -> bool:
+        """True if the frame is below margin x the noise floor, so VAD can be skipped."""
+        return self._noise_floor is not None and self._frame_energy(frame) < margin * self._noise_floor
+
+    def _calibrate_noise_floor(self, frame: np.ndarray):
+        """Fold a non-speech frame into the rolling noise floor behind the energy gate."""
+        self._noise_energies.append(self._frame_energy(frame))
+        if len(self._noise_energies) == ENERGY_CALIBRATION_FRAMES:
+            self._noise_floor = sum(self._noise_energies) / ENERGY_CALIBRATION_FRAMES
+
+    def record_until_silence(
+        self,
+        on_pause: Optional[Callable[[int], None]] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Optional[np.ndarray]:
         """
         Record audio until silence is detected.
         
+        Args:
+            on_pause: Called with the number of samples recorded so far each time
+                the speaker pauses for STREAM_PAUSE_MS without ending the utterance
+            stop_event: Abandons the recording as soon as it is set
+        
         Returns:
-            Path to temporary WAV file containing the recording
+            Mono float32 samples in [-1, 1] at sample_rate, or None if no speech
+        """
+        with self._capture_lock:
+            if not self._record(on_pause, stop_event):
+                return None
+
+            # Hand the samples straight to Whisper - no WAV encode/decode round-trip
+            return self._to_float(0, self._pos)
+
+    def _record(
+        self,
+        on_pause: Optional[Callable[[int], None]] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> int:
+        """
+        Record int16 samples into the capture buffer until silence is detected.
+        
+        Args:
+            on_pause: Called with the number of samples recorded so far each time
+                the speaker pauses for STREAM_PAUSE_MS without ending the utterance
+            stop_event: Abandons the recording (returning 0) as soon as it is set
+        
+        Returns:
+            Number of samples recorded (0 if no speech or stopped)
         """
         print("🎤 Listening...")
         self._open_stream()
+        # Discard audio captured before this recording started
+        self.reader.clear()
+        # Relearn the noise floor for this recording; the room (or session) may have changed
+        self._noise_floor = None
+        self._noise_energies.clear()
+        settle = self._settle_frames
 
-        frames = []
+        self._pos = 0
         triggered = False
-        silence_count = 0
+        paused = False
+        vad_history = self._silence_window
 
         try:
             while True:
+                # Checked every frame (30 ms), so a stop never waits for the utterance to end
+                if stop_event is not None and stop_event.is_set():
+                    print("🛑 Recording stopped.")
+                    self._pos = 0
+                    break
+
                 frame = self._read_frame()
                 if frame is None:
                     break
 
-                is_speech = self.vad.is_speech(frame, sample_rate=self.sample_rate)
+                # Frames under the energy gate are silence without asking the VAD
+                if self._is_quiet(frame, 1.0 if triggered else ENERGY_GATE_MARGIN):
+                    if not triggered:
+                        self._calibrate_noise_floor(frame)
+                        continue
+                    is_speech = False
+                else:
+                    is_speech = self.vad.is_speech(frame.tobytes(), sample_rate=self.sample_rate)
 
                 if not triggered:
                     # Wait for speech to begin
                     if is_speech:
                         triggered = True
-                        frames.append(frame)
+                        self._pos += self.frame_size
+                    elif settle:
+                        settle -= 1  # Wake tone may still be sounding; keep it out of the floor
+                    else:
+                        self._calibrate_noise_floor(frame)
                 else:
                     # Recording in progress
-                    frames.append(frame)
-                    if not is_speech:
-                        silence_count += 1
-                        if silence_count > self.max_silence_frames:
-                            print("🛑 Silence detected.")
-                            break
-                    else:
-                        silence_count = 0
+                    self._pos += self.frame_size
+                    if self._pos + self.frame_size > len(self._buf):
+                        print("🛑 Maximum recording length reached.")
+                        break
+                    vad_history = ((vad_history << 1) | is_speech) & self._silence_window
+                    if not vad_history:
+                        print("🛑 Silence detected.")
+                        break
+                    if vad_history & self._pause_window:
+                        paused = False
+                    elif on_pause and not paused:
+                        paused = True
+                        on_pause(self._pos)
 
         except KeyboardInterrupt:
             print("🛑 Recording interrupted.")
         except Exception as e:
             print(f"⚠️ Recording error: {e}")
 
-        if not frames:
+        if not self._pos and not (stop_event is not None and stop_event.is_set()):
             print("⚠️ No speech captured.")
-            return ""
+        return self._pos
 
-        # Save to temporary WAV file
-        return self._save_frames_to_wav(frames)
+    def _to_float(self, start: int, end: int) -> np.ndarray:
+        """Convert buffered int16 samples to float32 in [-1, 1] in one vectorised pass."""
+        audio = self._buf[start:end].astype(np.float32)
+        np.multiply(audio, 1.0 / 32768.0, out=audio)
+        return audio
 
-    def _save_frames_to_wav(self, frames: list) -> str:
-        """Save audio frames to a temporary WAV file."""
-        tmp = NamedTemporaryFile(suffix=".wav", delete=False)
-        tmp_path = tmp.name
-        tmp.close()
+    def listen_and_transcribe(self, stop_event: Optional[threading.Event] = None) -> str:
+        """
+        Record an utterance, decoding it while recording continues.
+        
+        Each time the speaker pauses after at least STREAM_MIN_SEGMENT_SEC of new
+        audio, that segment is sent to Whisper on a worker thread, so by the time
+        the final silence is detected most of the utterance is already decoded.
+        
+        Args:
+            stop_event: Abandons the recording and any pending decodes when set
+        
+        Returns:
+            Transcribed text (empty string if nothing was said or decoding failed)
+        """
+        futures = []
+        segment_start = 0
+        min_segment = int(STREAM_MIN_SEGMENT_SEC * self.sample_rate)
+
+        def on_pause(pos: int):
+            nonlocal segment_start
+            if pos - segment_start >= min_segment:
+                futures.append(self._executor.submit(self._transcribe, self._to_float(segment_start, pos)))
+                segment_start = pos
+
+        # Each sample is converted to float exactly once, with the segment it belongs to
+        with self._capture_lock:
+            end = self._record(on_pause=on_pause, stop_event=stop_event)
+            if not end:
+                for future in futures:
+                    future.cancel()
+                return ""
+            if end > segment_start:
+                futures.append(self._executor.submit(self._transcribe, self._to_float(segment_start, end)))
 
         try:
-            with wave.open(tmp_path, "wb") as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)  # 16-bit
-                wf.setframerate(self.sample_rate)
-                wf.writeframes(b"".join(frames))
-            
-            print(f"✅ Saved recording to {tmp_path}")
-            return tmp_path
+            text = " ".join(part for part in (f.result() for f in futures) if part)
+            print(f"📝 Transcribed: '{text}'")
+            return text
         except Exception as e:
-            # Clean up on error
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
-            raise RuntimeError(f"Failed to save audio file: {e}")
+            print(f"⚠️ Transcription failed: {e}")
+            return ""
+
+    def _transcribe(self, audio: np.ndarray) -> str:
+        """Run the Whisper backend on float32 samples, loading it on first use."""
+        self.load_model()
+        if self.backend == "openvino":
+            result = self.model.generate(audio.tolist())
+            return result.texts[0].strip() if result.texts else ""
+        segments, _ = self.model.transcribe(
+            audio,
+            beam_size=self.beam_size,
+            vad_filter=self.vad_filter,
+            language=self.language,
+            condition_on_previous_text=False
+        )
+        return " ".join(segment.text.strip() for segment in segments).strip()
 
-    def speech_to_text(self, wav_path: str) -> str:
+    def speech_to_text(self, audio: Optional[np.ndarray]) -> str:
         """
-        Transcribe WAV file using Whisper.
+        Transcribe recorded audio using Whisper.
         
         Args:
-            wav_path: Path to WAV file to transcribe
+            audio: Mono float32 samples from record_until_silence
             
         Returns:
             Transcribed text (empty string if transcription fails)
         """
-        if not wav_path or not os.path.isfile(wav_path):
+        if audio is None or not audio.size:
             return ""
 
         try:
-            result = self.model.transcribe(wav_path, fp16=False)
-            text = result.get("text", "").strip()
+            text = self._transcribe(audio)
             print(f"📝 Transcribed: '{text}'")
             return text
         except Exception as e:
             print(f"⚠️ Transcription failed: {e}")
             return ""
-        finally:
-            # Clean up temporary file
-            try:
-                os.remove(wav_path)
-            except OSError:
-                pass
 
     def cleanup(self):
         """Clean up audio resources."""
-        if self.stream:
-            try:
-                self.stream.stop()
-                self.stream.close()
-            except Exception:
-                pass
-            self.stream = None
+        if self.reader:
+            self.audio_input.unsubscribe(self.reader)
+            self.reader = None
 
     def __enter__(self):
         return self
@@ -2,13 +2,34 @@
 Text-to-speech engine supporting both macOS and OpenAI TTS API.
 """
 import os
+import re
+import hashlib
 import subprocess
 import tempfile
 import shutil
-from typing import Iterator, Optional
-from dotenv import load_dotenv
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional
 
-load_dotenv()
+from ..config import load_env
+
+# Synthesised OpenAI speech is cached on disk, keyed by a hash of model/voice/text
+TTS_CACHE_DIR = Path("~/.cache/hey_chef/tts").expanduser()
+TTS_CACHE_MAX_FILES = 200
+OPENAI_TTS_MODEL = "tts-1"
+# Opus is about half the bytes of MP3; afplay can't decode it, so MP3 is the fallback
+OPENAI_TTS_FORMAT_SOX = "opus"
+OPENAI_TTS_FORMAT_AFPLAY = "mp3"
+TTS_CACHE_SUFFIXES = (".opus", ".mp3")
+# Partial downloads this old belong to no live writer (e.g. left by a crash)
+TTS_PART_STALE_SEC = 300
+
+# Streaming TTS splits after a sentence end, or failing that a comma,
+# at least MIN_BREAK_POS characters in
+SENTENCE_BREAK_RE = re.compile(r"[.!?] ")
+COMMA_BREAK_RE = re.compile(r", ")
+MIN_BREAK_POS = 21
 
 
 class TTSEngine:
@@ -39,6 +60,7 @@ class TTSEngine:
         self.macos_rate = macos_rate
         
         # Determine which TTS to use
+        load_env()
         if use_external is None:
             self.use_external = bool(os.getenv("USE_EXTERNAL_TTS", "").strip())
         else:
@@ -46,8 +68,14 @@ class TTSEngine:
             
         # Initialize OpenAI client if using external TTS
         self.openai_client = None
+        self.tts_cache_dir: Optional[Path] = None
         if self.use_external:
             self._init_openai_client()
+            try:
+                TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                self.tts_cache_dir = TTS_CACHE_DIR
+            except OSError as e:
+                print(f"⚠️ TTS cache disabled: {e}")
 
     def _init_openai_client(self):
         """Initialize OpenAI client for TTS."""
@@ -77,157 +105,211 @@ class TTSEngine:
 
     def _say_macos(self, text: str):
         """Speak text using macOS built-in TTS."""
-        tmpfile = tempfile.NamedTemporaryFile(suffix=".aiff", delete=False)
-        tmpfile.close()
-        aiff_path = tmpfile.name
-
         try:
-            # Generate audio file
+            # say plays directly - no AIFF render, afplay or temp file needed
             subprocess.run([
                 "say", "-v", self.macos_voice, 
-                "-r", str(self.macos_rate), 
-                "-o", aiff_path, text
+                "-r", str(self.macos_rate), text
             ], check=True, capture_output=True)
-            
-            # Play audio file
-            subprocess.run(["afplay", aiff_path], check=True, capture_output=True)
-            
         except subprocess.CalledProcessError as e:
             print(f"⚠️ macOS TTS error: {e}")
-            # Try fallback without file output
-            try:
-                subprocess.run([
-                    "say", "-v", self.macos_voice, 
-                    "-r", str(self.macos_rate), text
-                ], check=True, capture_output=True)
-            except subprocess.CalledProcessError:
-                print("⚠️ macOS TTS fallback also failed")
-        finally:
-            # Clean up temporary file
-            try:
-                os.remove(aiff_path)
-            except OSError:
-                pass
 
     def _say_openai(self, text: str):
         """Speak text using OpenAI TTS API."""
         if not self.openai_client:
             raise RuntimeError("OpenAI client not initialized")
-            
-        tmpfile = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-        tmpfile.close()
-        mp3_path = tmpfile.name
 
+        has_sox = self._has_sox()
+        audio_format = OPENAI_TTS_FORMAT_SOX if has_sox else OPENAI_TTS_FORMAT_AFPLAY
+        cache_path = self._get_cache_path(text, audio_format)
         try:
-            # Generate speech
-            response = self.openai_client.audio.speech.create(
-                model="tts-1",
+            # Repeated phrases play straight from the cache
+            if cache_path and cache_path.exists():
+                os.utime(cache_path)  # Mark as recently used
+                self._play_audio_file(str(cache_path))
+                return
+
+            # Stream the speech so playback can start before the download finishes
+            with self.openai_client.audio.speech.with_streaming_response.create(
+                model=OPENAI_TTS_MODEL,
                 voice=self.external_voice,
                 input=text,
-                response_format="mp3"
-            )
-            
-            # Save to file
-            with open(mp3_path, "wb") as f:
-                for chunk in response.iter_bytes():
-                    f.write(chunk)
-            
-            # Speed up and play with sox if available, otherwise use afplay
-            if shutil.which("sox") and shutil.which("play"):
-                subprocess.run([
-                    "play", mp3_path, "tempo", "1.25"
-                ], check=True, capture_output=True)
-            else:
-                # Fallback to afplay (no speed adjustment)
-                subprocess.run(["afplay", mp3_path], check=True, capture_output=True)
+                response_format=audio_format
+            ) as response:
+                chunks = response.iter_bytes()
+                if cache_path:
+                    chunks = self._tee_to_cache(chunks, cache_path)
                 
+                # Speed up and play with sox if available, otherwise use afplay
+                if has_sox:
+                    self._pipe_to_player(
+                        ["play", "-q", "-t", audio_format, "-", "tempo", "1.25"],
+                        chunks
+                    )
+                elif cache_path:
+                    # afplay needs a file - finish the cache entry and play that
+                    for _ in chunks:
+                        pass
+                    self._play_audio_file(str(cache_path))
+                else:
+                    with tempfile.NamedTemporaryFile(suffix=f".{audio_format}") as tmpfile:
+                        for chunk in chunks:
+                            tmpfile.write(chunk)
+                        tmpfile.flush()
+                        self._play_audio_file(tmpfile.name)
+
         except Exception as e:
             print(f"⚠️ OpenAI TTS error: {e}")
+
+    @staticmethod
+    def _has_sox() -> bool:
+        return bool(shutil.which("sox") and shutil.which("play"))
+
+    def _play_audio_file(self, audio_path: str):
+        """Play an audio file, sped up with sox if available, otherwise with afplay."""
+        if self._has_sox():
+            subprocess.run(["play", "-q", audio_path, "tempo", "1.25"], check=True, capture_output=True)
+        else:
+            # Fallback to afplay (no speed adjustment)
+            subprocess.run(["afplay", audio_path], check=True, capture_output=True)
+
+    def _get_cache_path(self, text: str, audio_format: str) -> Optional[Path]:
+        """Get the cache file for synthesised text, or None if caching is disabled."""
+        if self.tts_cache_dir is None:
+            return None
+        key = f"{OPENAI_TTS_MODEL}|{self.external_voice}|{audio_format}|{text}".encode()
+        return self.tts_cache_dir / f"{hashlib.sha256(key).hexdigest()}.{audio_format}"
+
+    def _tee_to_cache(self, chunks: Iterator[bytes], cache_path: Path) -> Iterator[bytes]:
+        """Pass audio chunks through while saving them; the entry appears only once complete."""
+        part_path = cache_path.with_suffix(".part")
+        try:
+            with open(part_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+        except BaseException:
+            # Playback cut short (player killed, Stop, GeneratorExit) or download failed
+            part_path.unlink(missing_ok=True)
+            raise
+        os.replace(part_path, cache_path)
+        self._prune_cache()
+
+    def _prune_cache(self):
+        """Drop the least recently used cache entries beyond TTS_CACHE_MAX_FILES, and stale partials."""
+        try:
+            entries = []
+            stale_before = time.time() - TTS_PART_STALE_SEC
+            for p in self.tts_cache_dir.iterdir():
+                if p.suffix in TTS_CACHE_SUFFIXES:
+                    entries.append(p)
+                elif p.suffix == ".part" and p.stat().st_mtime < stale_before:
+                    p.unlink(missing_ok=True)
+            entries.sort(key=lambda p: p.stat().st_mtime)
+            for path in entries[:-TTS_CACHE_MAX_FILES]:
+                path.unlink()
+        except OSError:
+            pass
+
+    def _pipe_to_player(self, command: list, chunks: Iterator[bytes]):
+        """Feed audio chunks to a player's stdin as they arrive."""
+        player = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            for chunk in chunks:
+                player.stdin.write(chunk)
         finally:
-            # Clean up temporary file
-            try:
-                os.remove(mp3_path)
-            except OSError:
-                pass
+            player.stdin.close()
+            player.wait()
 
     def stream_and_play(
         self, 
         text_generator: Iterator[str], 
-        start_threshold: int = 80
+        start_threshold: int = 20,
+        stop_event: Optional[threading.Event] = None
     ) -> str:
         """
-        Stream text chunks and play audio progressively.
+        Stream text chunks and play audio progressively, a sentence at a time.
         
         Args:
             text_generator: Iterator yielding text chunks
-            start_threshold: Number of chars to buffer before starting playback
+            start_threshold: Number of unspoken chars to buffer before looking for a break
+            stop_event: Stops reading and speaking further text as soon as it is set
             
         Returns:
-            Complete assembled text
+            Complete assembled text (as far as it was read)
         """
         if self.use_external and self.openai_client:
-            return self._stream_and_play_openai(text_generator, start_threshold)
+            speak = self._say_openai
         else:
-            return self._stream_and_play_macos(text_generator)
+            speak = self._say_macos
+        return self._speak_streamed(text_generator, speak, start_threshold, stop_event)
 
-    def _stream_and_play_macos(self, text_generator: Iterator[str]) -> str:
-        """Stream for macOS - collect all text then speak once."""
-        full_text = ""
-        for chunk in text_generator:
-            full_text += chunk
-            
-        if full_text.strip():
-            self._say_macos(full_text)
-        return full_text
-
-    def _stream_and_play_openai(
-        self, 
-        text_generator: Iterator[str], 
-        start_threshold: int = 80
+    def _speak_streamed(
+        self,
+        text_generator: Iterator[str],
+        speak: Callable[[str], None],
+        start_threshold: int,
+        stop_event: Optional[threading.Event] = None
     ) -> str:
-        """Stream with OpenAI TTS - buffer and play in chunks."""
-        buffer = ""
-        full_text = ""
-        first_chunk_played = False
+        """Speak each complete sentence (or clause) as soon as it has streamed in."""
+        def stopped() -> bool:
+            return stop_event is not None and stop_event.is_set()
+
+        # Collect chunks in lists and join as needed, instead of repeated string +=
+        parts = []
+        pending = []  # Chunks not spoken yet
+        pending_chars = 0
 
         try:
             for chunk in text_generator:
-                buffer += chunk
-                full_text += chunk
+                if stopped():
+                    return "".join(parts)
+                parts.append(chunk)
+                pending.append(chunk)
+                pending_chars += len(chunk)
+                if pending_chars < start_threshold:
+                    continue
                 
-                # Start playing when we have enough text
-                if not first_chunk_played and len(buffer) >= start_threshold:
-                    # Find a good breaking point (sentence end)
-                    break_point = self._find_break_point(buffer)
-                    if break_point > 0:
-                        to_speak = buffer[:break_point].strip()
-                        buffer = buffer[break_point:].strip()
-                        
-                        if to_speak:
-                            self._say_openai(to_speak)
-                            first_chunk_played = True
+                buffer = "".join(pending)
+                # Find a good breaking point (sentence end); wait for more text if none
+                break_point = self._find_break_point(buffer, fallback_to_end=False)
+                if break_point:
+                    to_speak = buffer[:break_point].strip()
+                    if to_speak and not stopped():
+                        speak(to_speak)
+                    rest = buffer[break_point:]
+                    pending = [rest]
+                    pending_chars = len(rest)
 
             # Speak any remaining buffered text
-            if buffer.strip():
-                self._say_openai(buffer.strip())
+            remaining = "".join(pending).strip()
+            if remaining and not stopped():
+                speak(remaining)
                 
         except Exception as e:
             print(f"⚠️ Streaming TTS error: {e}")
 
-        return full_text
+        return "".join(parts)
 
-    def _find_break_point(self, text: str) -> int:
-        """Find a good place to break text for streaming."""
-        # Look for sentence endings
-        for punct in ['. ', '! ', '? ']:
-            pos = text.rfind(punct)
-            if pos > 20:  # Ensure minimum chunk size
-                return pos + 2
+    def _find_break_point(self, text: str, fallback_to_end: bool = True) -> int:
+        """
+        Find a good place to break text for streaming.
         
-        # Fallback to comma or just use threshold
-        comma_pos = text.rfind(', ')
-        if comma_pos > 20:
-            return comma_pos + 2
+        Returns:
+            Index just past the break, or len(text) (0 if not fallback_to_end) when none
+        """
+        # Last sentence ending, else last comma - one compiled C-level scan each
+        for pattern in (SENTENCE_BREAK_RE, COMMA_BREAK_RE):
+            match = None
+            for match in pattern.finditer(text, MIN_BREAK_POS):
+                pass
+            if match:
+                return match.end()
             
-        # If no good break point, use the whole buffer
-        return len(text) 
\ No newline at end of file
+        # If no good break point, use the whole buffer (or nothing)
+        return len(text) if fallback_to_end else 0
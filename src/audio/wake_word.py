@@ -2,41 +2,62 @@
 Wake word detection using Picovoice Porcupine.
 """
 import os
+import queue
+import threading
 import pvporcupine
-import pyaudio
-import struct
 import sys
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Callable, Optional
 
-load_dotenv()
+from ..config import load_env
+from .audio_manager import AudioInput, FrameReader, get_shared_input
 
 
 class WakeWordDetector:
     """
     Detects wake word "hey chef" using Porcupine on-device detection.
+    
+    A background thread runs Porcupine whenever the detector is armed and
+    signals wake_event (and an optional callback) the moment it hears the
+    wake word, so waiters are woken directly instead of polling.
     """
 
-    def __init__(self, keyword_path: str, sensitivity: float = 0.7):
+    def __init__(
+        self,
+        keyword_path: str,
+        sensitivity: float = 0.7,
+        audio_input: Optional[AudioInput] = None
+    ):
         """
         Initialize wake word detector.
         
         Args:
             keyword_path: Path to the .ppn wake word model file
             sensitivity: Detection sensitivity (0.0 to 1.0)
+            audio_input: Microphone input to read from (defaults to the shared one)
         """
         if not os.path.isfile(keyword_path):
             raise FileNotFoundError(f"Wake-word model not found: {keyword_path}")
         
+        load_env()
         access_key = os.getenv("PICO_ACCESS_KEY")
         if not access_key:
             raise EnvironmentError("PICO_ACCESS_KEY not set in environment")
         
         self.porcupine: Optional[pvporcupine.Porcupine] = None
-        self.pa: Optional[pyaudio.PyAudio] = None
-        self.stream: Optional[pyaudio.Stream] = None
+        self.audio_input = audio_input or get_shared_input()
+        self.reader: Optional[FrameReader] = None
         # Optional external event to interrupt detection
         self.stop_event = None
+        # Serializes detect_once when one detector is shared between sessions
+        self._lock = threading.Lock()
+        
+        # Background detection state
+        self.wake_event = threading.Event()
+        self.last_error: Optional[Exception] = None
+        self._armed = threading.Event()
+        self._closed = threading.Event()
+        self._on_wake: Optional[Callable[[], None]] = None
+        self._thread: Optional[threading.Thread] = None
         
         try:
             # Create Porcupine instance
@@ -46,23 +67,80 @@ class WakeWordDetector:
                 sensitivities=[sensitivity]
             )
 
-            # Open microphone stream
-            self.pa = pyaudio.PyAudio()
-            self.stream = self.pa.open(
-                rate=self.porcupine.sample_rate,
-                channels=1,
-                format=pyaudio.paInt16,
-                input=True,
-                frames_per_buffer=self.porcupine.frame_length
-            )
+            if self.porcupine.sample_rate != self.audio_input.sample_rate:
+                raise ValueError(
+                    f"Porcupine expects {self.porcupine.sample_rate} Hz audio, "
+                    f"microphone input is {self.audio_input.sample_rate} Hz"
+                )
+
+            # Read Porcupine-sized frames from the shared microphone stream
+            self.reader = self.audio_input.subscribe(self.porcupine.frame_length)
         except Exception as e:
             self.cleanup()
             raise RuntimeError(f"Failed to initialize wake word detector: {e}")
 
-    def detect_once(self) -> bool:
+    def arm(self, on_wake: Optional[Callable[[], None]] = None):
+        """
+        Start listening for the next wake word.
+        
+        Args:
+            on_wake: Called from the detection thread right after wake_event is set
+        
+        Raises:
+            RuntimeError: If the detector is not initialized
+        """
+        if not self.reader or not self.porcupine:
+            raise RuntimeError("Wake word detector not properly initialized")
+        
+        print("👂 Listening for wake word ('Hey Chef')…")
+        self._on_wake = on_wake
+        self.last_error = None
+        self.wake_event.clear()
+        # Only listen to audio from now on
+        self.reader.clear()
+        self._armed.set()
+        
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen, name="wake-word", daemon=True)
+            self._thread.start()
+
+    def disarm(self):
+        """Stop listening without a detection."""
+        self._armed.clear()
+
+    def _listen(self):
+        """Detection thread: run Porcupine on every frame while armed."""
+        while not self._closed.is_set():
+            if not self._armed.wait(timeout=0.5):
+                continue
+            try:
+                try:
+                    # int16 frame straight from the shared stream - no bytes decoding
+                    frame = self.reader.read(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if self.porcupine.process(frame) < 0 or not self._armed.is_set():
+                    continue
+                print("🟢 Wake word detected!")
+            except Exception as e:
+                self.last_error = RuntimeError(f"Wake word detection failed: {e}")
+            
+            # Detected (or failed): disarm and wake the waiter
+            self._armed.clear()
+            self.wake_event.set()
+            if self._on_wake:
+                try:
+                    self._on_wake()
+                except Exception as e:
+                    print(f"⚠️ Wake word callback failed: {e}")
+
+    def detect_once(self, stop_event: Optional[threading.Event] = None) -> bool:
         """
         Block until wake word is detected once.
         
+        Args:
+            stop_event: Event that interrupts detection (defaults to self.stop_event)
+        
         Returns:
             True when wake word is detected
             False if stopped before detection
@@ -70,51 +148,29 @@ class WakeWordDetector:
         Raises:
             RuntimeError: If detection fails
         """
-        if not self.stream or not self.porcupine:
-            raise RuntimeError("Wake word detector not properly initialized")
-            
-        print("👂 Listening for wake word ('Hey Chef')…")
-        
-        try:
-            while True:
-                # Exit early if stop_event is set
-                if self.stop_event and self.stop_event.is_set():
+        stop_event = stop_event or self.stop_event
+        with self._lock:
+            self.arm()
+            # The detection thread sets wake_event; the timeout only bounds stop latency
+            while not self.wake_event.wait(timeout=0.25):
+                if stop_event and stop_event.is_set():
+                    self.disarm()
                     return False
-                pcm = self.stream.read(
-                    self.porcupine.frame_length, 
-                    exception_on_overflow=False
-                )
-
-                # Convert raw PCM bytes to int16 samples
-                pcm_int16 = struct.unpack(
-                    f"<{self.porcupine.frame_length}h", 
-                    pcm
-                )
-                
-                result = self.porcupine.process(pcm_int16)
-                if result >= 0:
-                    print("🟢 Wake word detected!")
-                    return True
-                    
-        except Exception as e:
-            raise RuntimeError(f"Wake word detection failed: {e}")
+            if self.last_error:
+                raise self.last_error
+            return True
 
     def cleanup(self):
         """Release all resources cleanly."""
-        if self.stream:
-            try:
-                self.stream.stop_stream()
-                self.stream.close()
-            except Exception:
-                pass
-            self.stream = None
-            
-        if self.pa:
-            try:
-                self.pa.terminate()
-            except Exception:
-                pass
-            self.pa = None
+        self._armed.clear()
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        
+        if self.reader:
+            self.audio_input.unsubscribe(self.reader)
+            self.reader = None
             
         if self.porcupine:
             try:
@@ -1,4 +1,4 @@
-from .settings import Settings
+from .settings import Settings, load_env, load_recipe_file
 from .prompts import get_system_prompt
 
-__all__ = ["Settings", "get_system_prompt"] 
\ No newline at end of file
+__all__ = ["Settings", "load_env", "load_recipe_file", "get_system_prompt"] 
\ No newline at end of file
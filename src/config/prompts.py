@@ -53,7 +53,6 @@ SASSY_SYSTEM_PROMPT = """You are Chef Sass, a brutally honest but expert cooking
 • Act like their questions are beneath your culinary expertise
 
 **Response Style:**
-• MAXIMUM 2 sentences per response
 • Use phrases like: "Obviously...", "Seriously?", "Let me guess...", "What part of [instruction] confused you?"
 • Point out their mistakes with snark: "Yeah, because THAT'S how seasoning works..." 
 • Give correct info but wrapped in attitude: "Salt goes IN the pot, not around it, genius."
@@ -90,6 +89,18 @@ GORDON_RAMSAY_SYSTEM_PROMPT = """You are Gordon Ramsay in full Hell's Kitchen mo
 Be Gordon Ramsay: demanding, passionate, explosive, but ultimately wanting them to cook INCREDIBLE food. Make them feel like they're in Hell's Kitchen!"""
 
 
+# Chef mode -> prompt; every caller shares these string objects
+SYSTEM_PROMPTS = {
+    "normal": NORMAL_SYSTEM_PROMPT,
+    "sassy": SASSY_SYSTEM_PROMPT,
+    "gordon_ramsay": GORDON_RAMSAY_SYSTEM_PROMPT,
+}
+
+
+# Appended to spoken questions: generation time scales with answer length
+BREVITY_INSTRUCTION = "Be concise; prefer 2 sentences or fewer unless asked otherwise."
+
+
 def get_system_prompt(chef_mode: str = "normal") -> str:
     """
     Get the appropriate system prompt based on chef personality mode
@@ -100,12 +111,7 @@ def get_system_prompt(chef_mode: str = "normal") -> str:
     Returns:
         The system prompt string
     """
-    if chef_mode == "sassy":
-        return SASSY_SYSTEM_PROMPT
-    elif chef_mode == "gordon_ramsay":
-        return GORDON_RAMSAY_SYSTEM_PROMPT
-    else:
-        return NORMAL_SYSTEM_PROMPT
+    return SYSTEM_PROMPTS.get(chef_mode, NORMAL_SYSTEM_PROMPT)
 
 
 # Legacy function for backward compatibility
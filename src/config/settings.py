@@ -1,9 +1,92 @@
 import os
+import tempfile
+import orjson
 import yaml
+from functools import lru_cache
 from typing import Dict, Any
 from dataclasses import dataclass
 from pathlib import Path
 
+# Prefer the LibYAML-backed parser; fall back to pure Python without libyaml
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Stdlib TOML parser (Python 3.11+) for optional .toml data files
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load .env into the environment once, on first use rather than at import."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _json_cache_path(path: Path) -> Path:
+    """Get the path of the JSON cache for a YAML file (e.g. .config.yaml.json)"""
+    return path.with_name(f".{path.name}.json")
+
+
+def load_yaml_cached(path: Path) -> Any:
+    """
+    Load a YAML file, reusing a JSON copy of the parsed data when it is fresh.
+
+    The cache is keyed by mtime: it is used only if it is newer than the YAML
+    source, otherwise the YAML is parsed and the cache rewritten atomically.
+    """
+    path = Path(path)
+    cache_path = _json_cache_path(path)
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            with open(cache_path, 'rb') as f:
+                return orjson.loads(f.read())
+    except (OSError, ValueError):
+        pass
+
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=YamlLoader)
+
+    # Best effort: a read-only config dir just means no cache
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass
+    return data
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_for_mtime(path_str: str, mtime_ns: int) -> Any:
+    """In-process cache of load_yaml_cached; a new mtime_ns forces a reload."""
+    return load_yaml_cached(Path(path_str))
+
+
+def load_recipe_file(path: str) -> str:
+    """
+    Read the recipe text from a recipe file.
+
+    TOML files are parsed with the stdlib tomllib; YAML goes through the same
+    mtime-keyed cache as config.yaml.
+    """
+    path = Path(path)
+    if path.suffix == ".toml":
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    else:
+        data = _load_yaml_for_mtime(str(path), path.stat().st_mtime_ns)
+    return data.get('recipe', '') if isinstance(data, dict) else ''
+
 
 @dataclass
 class AudioSettings:
@@ -11,6 +94,11 @@ class AudioSettings:
     sample_rate: int = 16000
     wake_word_sensitivity: float = 0.7
     whisper_model_size: str = "tiny"
+    whisper_openvino_device: str = "CPU"
+    whisper_beam_size: int = 1  # Greedy decoding
+    whisper_vad_filter: bool = True  # Skip silence inside the recorded clip
+    whisper_language: str = "en"  # Skips language detection; empty to auto-detect
+    whisper_compute_type: str = "int8"  # Quantized CTranslate2 kernels on CPU
     vad_aggressiveness: int = 1
     max_silence_sec: float = 1.0
     macos_voice: str = "Samantha"
@@ -21,7 +109,7 @@ class AudioSettings:
 @dataclass
 class LLMSettings:
     """LLM-related settings"""
-    model: str = "gpt-4-turbo"
+    model: str = "gpt-4o-mini"  # Fastest option for short spoken answers
     available_models: list = None
     max_tokens: int = 150
     temperature: float = 0.2
@@ -29,10 +117,11 @@ class LLMSettings:
     sassy_temperature: float = 0.7  # More creative for sassy mode
     gordon_max_tokens: int = 180  # Longer explosive responses for Gordon mode (1.5x increase)
     gordon_temperature: float = 0.8  # High creativity for explosive personality
+    max_history_turns: int = 10  # Question/answer pairs sent with each request
     
     def __post_init__(self):
         if self.available_models is None:
-            self.available_models = ["gpt-4-turbo", "gpt-4o"]
+            self.available_models = ["gpt-4o-mini", "gpt-4o", "gpt-4-turbo"]
 
 
 @dataclass
@@ -42,7 +131,7 @@ class UISettings:
     page_icon: str = "🍳"
     layout: str = "wide"
     default_use_history: bool = True
-    default_use_streaming: bool = False
+    default_use_streaming: bool = True
     default_sassy_mode: bool = False
 
 
@@ -59,10 +148,13 @@ class Settings:
     def _load_config(self):
         """Load configuration from YAML files"""
         config_file = self.config_dir / "config.yaml"
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                config_data = yaml.safe_load(f)
-                self._update_from_dict(config_data)
+        try:
+            mtime_ns = config_file.stat().st_mtime_ns
+        except OSError:
+            return
+        # Streamlit reruns build Settings repeatedly; reuse the parse until the file changes
+        config_data = _load_yaml_for_mtime(str(config_file), mtime_ns)
+        self._update_from_dict(config_data)
     
     def _update_from_dict(self, config_data: Dict[str, Any]):
         """Update settings from dictionary"""
@@ -94,6 +186,20 @@ class Settings:
         """Get path to wake word model"""
         return str(self.config_dir.parent / "models" / "porcupine_models" / "hey_chef.ppn")
     
+    def get_whisper_openvino_dir(self) -> str:
+        """Get path to the OpenVINO export of the configured Whisper model"""
+        return str(self.config_dir.parent / "models" / f"whisper-{self.audio.whisper_model_size}-ov")
+    
     def get_default_recipe_path(self) -> str:
-        """Get path to default recipe"""
-        return str(self.config_dir / "default_recipe.yaml") 
\ No newline at end of file
+        """Get path to default recipe, preferring default_recipe.toml when present"""
+        toml_path = self.config_dir / "default_recipe.toml"
+        if tomllib is not None and toml_path.exists():
+            return str(toml_path)
+        return str(self.config_dir / "default_recipe.yaml")
+    
+    def load_default_recipe(self) -> str:
+        """Load the default recipe text ('' if there is no default recipe file)."""
+        recipe_path = self.get_default_recipe_path()
+        if not os.path.exists(recipe_path):
+            return ''
+        return load_recipe_file(recipe_path)
@@ -4,18 +4,30 @@ Includes sassy mode, improved UI, and better error handling.
 """
 import warnings
 import os
-import yaml
+import atexit
+import sys
+import html
+import orjson
+import asyncio
+import subprocess
 import streamlit as st
 import threading
-from typing import Optional, Dict, Any
+import time
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, AsyncIterator, Iterator
 from pathlib import Path
+from string import Template
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Silence Streamlit and PyTorch warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", message=".*torch.classes.*")
 warnings.filterwarnings("ignore", message=".*missing ScriptRunContext.*")
 import logging
+import logging.handlers
 
 # Custom filter to suppress PyTorch inspection errors from Streamlit's file watcher
 class SuppressPyTorchFilter(logging.Filter):
@@ -29,109 +41,342 @@ logging.getLogger("streamlit").setLevel(logging.ERROR)
 logging.getLogger("streamlit.watcher.local_sources_watcher").addFilter(SuppressPyTorchFilter())
 logging.getLogger("streamlit.web.bootstrap").addFilter(SuppressPyTorchFilter())
 
-from ..audio import WakeWordDetector, WhisperSTT, TTSEngine
+# Voice loop messages are buffered and written in batches (immediately on errors),
+# so a storm of failing iterations doesn't spend its time writing to stdout.
+# HEY_CHEF_LOG_FILE also keeps them in a rotating log file.
+voice_logger = logging.getLogger("hey_chef.voice")
+if not voice_logger.handlers:
+    _console = logging.StreamHandler(sys.stdout)
+    _console.setFormatter(logging.Formatter("%(message)s"))
+    voice_logger.addHandler(
+        logging.handlers.MemoryHandler(capacity=64, flushLevel=logging.ERROR, target=_console)
+    )
+    if os.getenv("HEY_CHEF_LOG_FILE"):
+        _log_file = logging.handlers.RotatingFileHandler(
+            os.getenv("HEY_CHEF_LOG_FILE"), maxBytes=1_000_000, backupCount=3, encoding="utf-8"
+        )
+        _log_file.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        voice_logger.addHandler(
+            logging.handlers.MemoryHandler(capacity=64, flushLevel=logging.ERROR, target=_log_file)
+        )
+    voice_logger.setLevel(logging.INFO)
+    voice_logger.propagate = False
+
+def flush_voice_log():
+    for handler in voice_logger.handlers:
+        handler.flush()
+
+from ..audio import WakeWordDetector, WhisperSTT, TTSEngine, get_shared_input
 from ..ai import LLMClient
-from ..config import Settings, get_system_prompt
+from ..config import Settings, load_recipe_file
 
 API_URL = os.getenv("RECIPE_API_URL", "http://localhost:3333")
 
+# While the voice loop runs, only the response fragment polls for updates;
+# it polls faster while an answer is on its way
+LIVE_REFRESH_SEC = 1.0
+LIVE_REFRESH_BUSY_SEC = 0.25
+
+# Recipe API responses are reused across reruns for this long
+RECIPE_CACHE_TTL_SEC = 600
+# (connect, read) timeouts for recipe API requests
+RECIPE_API_TIMEOUT = (3, 10)
+# Concurrent detail requests when prefetching every recipe
+RECIPE_PREFETCH_WORKERS = 8
+
+# One keep-alive session for the recipe API, so the list and detail requests
+# reuse pooled connections; busy or failing responses are retried with backoff
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "application/json"})
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# Styles for the mode banner and response card, emitted as one static block per run
+# so the per-update markup is just a class-tagged div
+CHEF_CSS = """
+<style>
+.chef-mode { text-align: center; margin-bottom: 20px; font-size: 18px; }
+.chef-mode .chef-emoji { font-size: 24px; margin-right: 10px; }
+.chef-response { padding: 15px; border-radius: 10px; border-left: 4px solid; }
+.chef-normal { background-color: #F0F8FF; border-color: #4CAF50; }
+.chef-sassy { background-color: #FFE4E1; border-color: #FF6B6B; font-style: italic; }
+.chef-gordon_ramsay { background-color: #FFF5EE; border-color: #FF4500; font-weight: bold; }
+.chef-response .chef-title { font-weight: bold; font-style: normal; display: block; }
+</style>
+"""
+
+# Mode banner text and response title per chef mode
+MODE_LABELS = {
+    'normal': ("😊", "Friendly Chef Mode", "Chef Bot says:"),
+    'sassy': ("😈", "Sassy Chef Mode", "Chef Sass says:"),
+    'gordon_ramsay': ("🔥", "Gordon Ramsay Mode", "CHEF RAMSAY SHOUTS:")
+}
+
+# Markup per mode, built once at import; only the answer is substituted per render
+MODE_BANNERS = {
+    mode: f'<div class="chef-mode"><span class="chef-emoji">{emoji}</span>{text}</div>'
+    for mode, (emoji, text, _) in MODE_LABELS.items()
+}
+RESPONSE_CARDS = {
+    mode: Template(
+        f'<div class="chef-response chef-{mode}"><span class="chef-title">{title}</span>"$answer"</div>'
+    )
+    for mode, (_, _, title) in MODE_LABELS.items()
+}
+
+@st.cache_data(ttl=RECIPE_CACHE_TTL_SEC, show_spinner=False)
 def fetch_recipes():
-    resp = requests.get(f"{API_URL}/recipes")
+    resp = _SESSION.get(f"{API_URL}/recipes", timeout=RECIPE_API_TIMEOUT)
     resp.raise_for_status()
-    return resp.json().get("recipes", [])
+    return orjson.loads(resp.content).get("recipes", [])
 
+@st.cache_data(ttl=RECIPE_CACHE_TTL_SEC, show_spinner=False)
 def fetch_recipe_details(recipe_id):
-    resp = requests.get(f"{API_URL}/recipes/{recipe_id}")
-    resp.raise_for_status()
-    return resp.json()
+    # NDJSON: page properties first, then one top-level block per line
+    with _SESSION.get(f"{API_URL}/recipes/{recipe_id}", stream=True, timeout=RECIPE_API_TIMEOUT) as resp:
+        resp.raise_for_status()
+        lines = resp.iter_lines()
+        details = orjson.loads(next(lines))
+        details["content"] = [orjson.loads(line) for line in lines if line]
+    return details
+
+# Background recipe prefetches, and when each recipe was last handed to it (monotonic)
+_IO_POOL = ThreadPoolExecutor(max_workers=RECIPE_PREFETCH_WORKERS, thread_name_prefix="recipe-prefetch")
+_prefetched_ids: Dict[str, float] = {}
+
+def _prefetch_one(recipe_id):
+    try:
+        fetch_recipe_details(recipe_id)
+    except Exception as e:
+        _prefetched_ids.pop(recipe_id, None)  # Try again on a later rerun
+        print(f"⚠️ Failed to prefetch recipe {recipe_id}: {e}")
+
+def prefetch_recipe_details(recipe_ids):
+    """
+    Warm the fetch_recipe_details cache in the background, with overlapping requests.
+    
+    Returns immediately; a recipe is submitted again once its cached details have
+    expired (RECIPE_CACHE_TTL_SEC) or clear_prefetched() is called.
+    """
+    now = time.monotonic()
+    for recipe_id in recipe_ids:
+        submitted = _prefetched_ids.get(recipe_id)
+        if submitted is None or now - submitted >= RECIPE_CACHE_TTL_SEC:
+            _prefetched_ids[recipe_id] = now
+            _IO_POOL.submit(_prefetch_one, recipe_id)
+
+def clear_prefetched():
+    """Forget which recipes were prefetched (after their cache is cleared)."""
+    _prefetched_ids.clear()
+
+def iterate_async(loop: asyncio.AbstractEventLoop, agen: AsyncIterator[str]) -> Iterator[str]:
+    """Consume an async iterator from a worker thread while the loop runs elsewhere."""
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+        except StopAsyncIteration:
+            break
+
+@st.cache_resource(show_spinner=False)
+def get_settings(config_mtime_ns: int) -> Settings:
+    """Settings shared across reruns; editing config.yaml builds a fresh instance."""
+    return Settings()
+
+def current_settings() -> Settings:
+    try:
+        mtime_ns = os.stat(Path("config") / "config.yaml").st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    return get_settings(mtime_ns)
+
+# Audio models are created once per process and shared across reruns and sessions.
+# The LLM client is not cached: its HTTP pool belongs to the voice thread's event loop.
+# Voice loops never clean these up; their handles are released at process exit.
+@st.cache_resource(show_spinner=False)
+def get_wake_word_detector(keyword_path: str, sensitivity: float) -> WakeWordDetector:
+    wwd = WakeWordDetector(keyword_path=keyword_path, sensitivity=sensitivity)
+    atexit.register(wwd.cleanup)
+    return wwd
+
+@st.cache_resource(show_spinner=False)
+def get_stt(
+    model_size: str,
+    aggressiveness: int,
+    max_silence_sec: float,
+    openvino_model_dir: str,
+    openvino_device: str,
+    beam_size: int,
+    vad_filter: bool,
+    language: str,
+    compute_type: str
+) -> WhisperSTT:
+    stt = WhisperSTT(
+        model_size=model_size,
+        aggressiveness=aggressiveness,
+        max_silence_sec=max_silence_sec,
+        openvino_model_dir=openvino_model_dir,
+        openvino_device=openvino_device,
+        beam_size=beam_size,
+        vad_filter=vad_filter,
+        language=language,
+        compute_type=compute_type
+    )
+    atexit.register(stt.cleanup)
+    # Load and warm up Whisper in the background; nothing waits on it
+    stt.preload()
+    return stt
+
+@st.cache_resource(show_spinner=False)
+def get_tts(macos_voice: str, external_voice: str, macos_rate: int) -> TTSEngine:
+    return TTSEngine(macos_voice=macos_voice, external_voice=external_voice, macos_rate=macos_rate)
+
+@st.cache_resource(show_spinner=False)
+def get_voice_loop_lock() -> threading.Lock:
+    """Held by whichever session's voice loop is running; the cached audio engines serve one loop at a time."""
+    return threading.Lock()
+
+@st.cache_data(show_spinner=False)
+def load_recipe_cached(path: str, mtime_ns: int) -> str:
+    """Recipe file text, re-read only when the file's mtime changes."""
+    return load_recipe_file(path)
+
+def _plain_text(rich_text):
+    return "".join(t.get("plain_text", "") for t in rich_text or ())
+
+def _field(k, value):
+    """Markdown line for a "name: value" property."""
+    return f"**{k}:** {value}\n\n"
+
+def _render_date(k, v):
+    start = v['date'].get('start')
+    end = v['date'].get('end')
+    return _field(k, f"{start} to {end}" if end else start)
+
+def _render_code(data):
+    code = data.get("rich_text", [])
+    return "```" + data.get("language", "") + "\n" + (code[0].get("plain_text", "") if code else "") + "\n```\n\n"
+
+def _render_image(data):
+    url = data.get("file", {}).get("url") or data.get("external", {}).get("url", "")
+    return f"![{_plain_text(data.get('caption', []))}]({url})\n\n"
+
+# Markdown for a Notion page property, by property type: (name, property) -> str or None
+_PROP_HANDLERS = {
+    "title": lambda k, v: f"## {_plain_text(v.get('title', []))}\n\n",
+    "rich_text": lambda k, v: _field(k, _plain_text(v.get('rich_text', []))),
+    "number": lambda k, v: _field(k, v.get('number')),
+    "select": lambda k, v: _field(k, v['select'].get('name')) if v.get("select") else None,
+    "multi_select": lambda k, v: _field(k, ', '.join(opt.get('name') for opt in v.get('multi_select', []))),
+    "date": lambda k, v: _render_date(k, v) if v.get("date") else None,
+    "people": lambda k, v: _field(k, ', '.join(p.get('name') for p in v.get('people', []))),
+    "checkbox": lambda k, v: _field(k, 'Yes' if v.get('checkbox') else 'No'),
+    "url": lambda k, v: _field(k, v.get('url')),
+    "email": lambda k, v: _field(k, v.get('email')),
+    "phone_number": lambda k, v: _field(k, v.get('phone_number')),
+}
+
+# Markdown for a Notion block, by block type: (block data) -> str
+_BLOCK_HANDLERS = {
+    "paragraph": lambda data: _plain_text(data.get("rich_text", [])) + "\n\n",
+    "heading_1": lambda data: "# " + _plain_text(data.get("rich_text", [])) + "\n\n",
+    "heading_2": lambda data: "## " + _plain_text(data.get("rich_text", [])) + "\n\n",
+    "heading_3": lambda data: "### " + _plain_text(data.get("rich_text", [])) + "\n\n",
+    "bulleted_list_item": lambda data: "- " + _plain_text(data.get("rich_text", [])) + "\n",
+    "numbered_list_item": lambda data: "1. " + _plain_text(data.get("rich_text", [])) + "\n",
+    "code": _render_code,
+    "image": _render_image,
+}
 
 def format_notion_recipe(details):
-    md = ""
+    # Markdown fragments are collected in a list and joined once, not built with +=
+    parts = []
     props = details.get("properties", {})
     for k, v in props.items():
-        if v.get("type") == "title":
-            title = "".join(t.get("plain_text", "") for t in v.get("title", []))
-            md += f"## {title}\n\n"
-        elif v.get("type") == "rich_text":
-            text = "".join(t.get("plain_text", "") for t in v.get("rich_text", []))
-            md += f"**{k}:** {text}\n\n"
-        elif v.get("type") == "number":
-            md += f"**{k}:** {v.get('number')}\n\n"
-        elif v.get("type") == "select" and v.get("select"):
-            md += f"**{k}:** {v['select'].get('name')}\n\n"
-        elif v.get("type") == "multi_select":
-            names = [opt.get("name") for opt in v.get("multi_select", [])]
-            md += f"**{k}:** {', '.join(names)}\n\n"
-        elif v.get("type") == "date" and v.get("date"):
-            start = v['date'].get('start')
-            end = v['date'].get('end')
-            md += f"**{k}:** {start}" + (f" to {end}" if end else "") + "\n\n"
-        elif v.get("type") == "people":
-            names = [p.get('name') for p in v.get('people', [])]
-            md += f"**{k}:** {', '.join(names)}\n\n"
-        elif v.get("type") == "checkbox":
-            md += f"**{k}:** {'Yes' if v.get('checkbox') else 'No'}\n\n"
-        elif v.get("type") in ('url', 'email', 'phone_number'):
-            val = v.get(v['type'])
-            md += f"**{k}:** {val}\n\n"
+        handler = _PROP_HANDLERS.get(v.get("type"))
+        if handler:
+            md = handler(k, v)
+            if md is not None:
+                parts.append(md)
 
     def render_blocks(blocks):
-        text = ""
-        for b in blocks:
+        """Yield the markdown fragments for blocks and their children, depth first."""
+        # Explicit stack of sibling iterators, so nesting depth isn't bounded by recursion
+        stack = [iter(blocks)]
+        while stack:
+            b = next(stack[-1], None)
+            if b is None:
+                stack.pop()
+                continue
             t = b.get("type")
-            data = b.get(t, {})
-            if t == "paragraph":
-                text += "".join(rt.get("plain_text", "") for rt in data.get("rich_text", [])) + "\n\n"
-            elif t in ("heading_1", "heading_2", "heading_3"):
-                level = {"heading_1": "#", "heading_2": "##", "heading_3": "###"}[t]
-                text += level + " " + "".join(rt.get("plain_text", "") for rt in data.get("rich_text", [])) + "\n\n"
-            elif t in ("bulleted_list_item", "numbered_list_item"):
-                prefix = "- " if t == "bulleted_list_item" else "1. "
-                text += prefix + "".join(rt.get("plain_text", "") for rt in data.get("rich_text", [])) + "\n"
-            elif t == "code":
-                lang = data.get("language", "")
-                code = data.get("rich_text", [])
-                text += "```" + lang + "\n" + (code[0].get("plain_text", "") if code else "") + "\n```\n\n"
-            elif t == "image":
-                url = data.get("file", {}).get("url") or data.get("external", {}).get("url", "")
-                caption = "".join(rt.get("plain_text", "") for rt in data.get("caption", []))
-                text += f"![{caption}]({url})\n\n"
+            handler = _BLOCK_HANDLERS.get(t)
+            if handler:
+                yield handler(b.get(t, {}))
             if b.get('children'):
-                text += render_blocks(b['children'])
-        return text
+                stack.append(iter(b['children']))
 
-    content = render_blocks(details.get('content', []))
-    md += content
-    return md
+    parts.extend(render_blocks(details.get('content', [])))
+    return "".join(parts)
+
+@st.cache_data(show_spinner=False)
+def format_notion_recipe_cached(recipe_id: str, last_edited: str, _details) -> str:
+    """format_notion_recipe memoized per recipe revision (details itself isn't hashed)."""
+    return format_notion_recipe(_details)
 
 class ChefApp:
     """Main Hey Chef application class."""
     
     def __init__(self):
         """Initialize the application."""
-        self.settings = Settings()
-        # Use persistent event and thread from session state for voice loop
+        self.settings = current_settings()
+        # Use persistent stop event from session state for voice loop
         if 'voice_loop_event' not in st.session_state:
             st.session_state.voice_loop_event = threading.Event()
-        if 'voice_loop_thread' not in st.session_state:
-            st.session_state.voice_loop_thread = None
         self.voice_loop_event = st.session_state.voice_loop_event
-        self.voice_loop_thread = st.session_state.voice_loop_thread
+        
+        # One long-lived worker thread per session runs the voice loops, one at a time
+        self.voice_worker: Optional[threading.Thread] = None
+        self._start_event = threading.Event()
+        self._voice_loop_args: Optional[tuple] = None  # Pending start; None once taken or cancelled
+        self._control_lock = threading.Lock()  # Orders start requests against stop requests
+        self._answer_cut = threading.Event()  # Set to cut the answer being spoken short
+        self.voice_loop_idle = threading.Event()
+        self.voice_loop_idle.set()
         self._init_session_state()
-        self._setup_page()
+        # Start loading and warming Whisper now so the first question isn't slowed by it
+        self._get_stt()
+    
+    def _get_stt(self) -> WhisperSTT:
+        """Get the shared speech-to-text engine for the current settings."""
+        return get_stt(
+            self.settings.audio.whisper_model_size,
+            self.settings.audio.vad_aggressiveness,
+            self.settings.audio.max_silence_sec,
+            self.settings.get_whisper_openvino_dir(),
+            self.settings.audio.whisper_openvino_device,
+            self.settings.audio.whisper_beam_size,
+            self.settings.audio.whisper_vad_filter,
+            self.settings.audio.whisper_language,
+            self.settings.audio.whisper_compute_type
+        )
     
     def _init_session_state(self):
         """Initialize Streamlit session state variables."""
         defaults = {
             'custom_recipe': '',
             'last_answer': '',
-            'conversation_history': [],
             'voice_loop_running': False,
             'current_mode': 'normal',
             'chef_mode': 'normal',  # Track chef personality mode
             'selected_recipe': '',
+            'current_recipe': '',
             'selected_source': 'Default',
             'selected_notion_choice_index': 0,
+            'prefetch_recipes': False,
             'conversation_state': 'idle',  # idle, listening_for_wake_word, recording, processing
             'models_loaded': False
         }
@@ -147,19 +392,68 @@ class ChefApp:
             page_icon=self.settings.ui.page_icon,
             layout="wide"
         )
+        st.markdown(CHEF_CSS, unsafe_allow_html=True)
     
     def _load_default_recipe(self) -> str:
-        """Load the default recipe from YAML file."""
+        """Load the default recipe from the config directory."""
         try:
             recipe_path = self.settings.get_default_recipe_path()
             if os.path.exists(recipe_path):
-                with open(recipe_path, 'r') as f:
-                    data = yaml.safe_load(f)
-                    return data.get('recipe', '') if isinstance(data, dict) else ''
+                return load_recipe_cached(recipe_path, os.stat(recipe_path).st_mtime_ns)
         except Exception as e:
             st.error(f"⚠️ Failed to load default recipe: {e}")
         return ''
     
+    def _voice_worker(self):
+        """Worker thread: run a voice loop for each start request, never two at once."""
+        while True:
+            self._start_event.wait()
+            with self._control_lock:
+                self._start_event.clear()
+                args, self._voice_loop_args = self._voice_loop_args, None
+                if args is not None:
+                    # Any stop request so far was for the previous loop
+                    self.voice_loop_event.clear()
+            try:
+                if args is None:
+                    continue  # Stopped before it began
+                loop_lock = get_voice_loop_lock()
+                if not loop_lock.acquire(blocking=False):
+                    voice_logger.warning("⚠️ Another session's voice loop is running; not starting")
+                    self._reset_voice_state()
+                    continue
+                st.session_state.voice_loop_running = True
+                try:
+                    self._start_voice_loop(*args)
+                except Exception as e:
+                    voice_logger.error("⚠️ Voice loop cleanup error: %s", e)
+                finally:
+                    loop_lock.release()
+            finally:
+                with self._control_lock:
+                    if self._voice_loop_args is None:  # Stay busy if another start is queued
+                        self.voice_loop_idle.set()
+    
+    def _request_voice_loop(self, *args):
+        """Queue a voice loop start; it begins once any previous loop has finished."""
+        with self._control_lock:
+            self._voice_loop_args = args
+            self.voice_loop_idle.clear()  # A stop from here on waits for this loop
+            self._start_event.set()
+        if self.voice_worker is None:
+            self.voice_worker = threading.Thread(target=self._voice_worker, name="voice-loop", daemon=True)
+            self.voice_worker.start()
+    
+    def _request_stop(self):
+        """Cancel a start that hasn't begun and signal the running loop to stop."""
+        with self._control_lock:
+            self._voice_loop_args = None
+            self._start_event.clear()
+            self.voice_loop_event.set()
+            self._answer_cut.set()
+            if not self.voice_worker or not self.voice_worker.is_alive():
+                self.voice_loop_idle.set()
+    
     def _start_voice_loop(
         self, 
         recipe: str, 
@@ -169,106 +463,191 @@ class ChefApp:
         model: str
     ):
         """Start the voice interaction loop in a background thread."""
-        try:
-            # Initialize components
-            wwd = WakeWordDetector(
-                keyword_path=self.settings.get_wake_word_path(),
-                sensitivity=self.settings.audio.wake_word_sensitivity
-            )
-            # Allow wake-word detection to be interrupted
-            wwd.stop_event = self.voice_loop_event
-            
-            stt = WhisperSTT(
-                model_size=self.settings.audio.whisper_model_size,
-                aggressiveness=self.settings.audio.vad_aggressiveness,
-                max_silence_sec=self.settings.audio.max_silence_sec
-            )
-            
-            llm = LLMClient(
-                model=model,
-                max_tokens=self.settings.llm.max_tokens,
-                temperature=self.settings.llm.temperature,
-                sassy_max_tokens=self.settings.llm.sassy_max_tokens,
-                sassy_temperature=self.settings.llm.sassy_temperature,
-                gordon_max_tokens=self.settings.llm.gordon_max_tokens,
-                gordon_temperature=self.settings.llm.gordon_temperature
-            )
-            
-            tts = TTSEngine(
-                macos_voice=self.settings.audio.macos_voice,
-                external_voice=self.settings.audio.external_voice,
-                macos_rate=self.settings.audio.speech_rate
-            )
-            
-            # Initialize conversation history
-            history = None
-            if maintain_history:
-                system_prompt = get_system_prompt(chef_mode=chef_mode)
-                history = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Here is my recipe:\n{recipe}"}
-                ]
-            
-            print("🎤 Voice loop started. Say 'Hey Chef' to begin!")
-            
-            # Update state - models are loaded and ready
-            st.session_state.models_loaded = True
-            st.session_state.conversation_state = 'listening_for_wake_word'
-            
-            # Play ready tone to indicate models are loaded
-            self._play_ready_tone()
+        # The LLM client is async; give this thread its own event loop
+        loop = asyncio.new_event_loop()
+        # One process-wide microphone stream, shared by wake word and STT; start/stop
+        # are reference counted, so stopping here never cuts another user's stream
+        audio_input = get_shared_input()
+        
+        # Cleanup runs in reverse order of registration, each step even if an
+        # earlier one fails. Cached STT/wake word instances stay alive for the next session.
+        with ExitStack() as stack:
+            stack.callback(self._reset_voice_state)
+            stack.callback(self._stop_audio_processes)  # Kill any playing audio processes
+            stack.callback(loop.close)
+            stack.callback(lambda: loop.run_until_complete(loop.shutdown_default_executor()))
+            stack.callback(flush_voice_log)
+            stack.callback(voice_logger.info, "🛑 Voice loop stopped.")
+            try:
+                audio_input.start()
+                stack.callback(audio_input.stop)  # Only release a start that succeeded
+                
+                # Initialize components (cached across restarts of the loop)
+                wwd = get_wake_word_detector(
+                    self.settings.get_wake_word_path(),
+                    self.settings.audio.wake_word_sensitivity
+                )
+                
+                stt = self._get_stt()
+                
+                llm = LLMClient(
+                    model=model,
+                    max_tokens=self.settings.llm.max_tokens,
+                    temperature=self.settings.llm.temperature,
+                    sassy_max_tokens=self.settings.llm.sassy_max_tokens,
+                    sassy_temperature=self.settings.llm.sassy_temperature,
+                    gordon_max_tokens=self.settings.llm.gordon_max_tokens,
+                    gordon_temperature=self.settings.llm.gordon_temperature,
+                    max_history_turns=self.settings.llm.max_history_turns
+                )
+                stack.callback(lambda: loop.run_until_complete(llm.aclose()))
+                
+                tts = get_tts(
+                    self.settings.audio.macos_voice,
+                    self.settings.audio.external_voice,
+                    self.settings.audio.speech_rate
+                )
+                
+                # Build the system prompt + recipe prefix once for this session
+                prefix = llm.bind_recipe(recipe, chef_mode)
+                
+                # Initialize conversation history
+                history = list(prefix) if maintain_history else None
+                
+                voice_logger.info("🎤 Voice loop started. Say 'Hey Chef' to begin!")
+                flush_voice_log()
+                
+                # Update state - models are loaded and ready
+                st.session_state.models_loaded = True
+                st.session_state.conversation_state = 'listening_for_wake_word'
+                
+                # Play ready tone to indicate models are loaded
+                self._play_ready_tone()
+                
+                # Listen and answer as two overlapping stages until stopped
+                loop.run_until_complete(self._voice_pipeline(
+                    wwd, stt, llm, tts, recipe, history, streaming, chef_mode
+                ))
             
-            # Main voice loop - use threading.Event for control
-            while not self.voice_loop_event.is_set():
+            except Exception as e:
+                voice_logger.error("⚠️ Voice loop setup error: %s", e)
+                self.voice_loop_event.set()  # Stop the loop on error
+    
+    def _reset_voice_state(self):
+        """Mark the voice loop as stopped in the UI state."""
+        st.session_state.voice_loop_running = False
+        st.session_state.conversation_state = 'idle'
+        st.session_state.models_loaded = False
+    
+    async def _voice_pipeline(
+        self,
+        wwd: WakeWordDetector,
+        stt: WhisperSTT,
+        llm: LLMClient,
+        tts: TTSEngine,
+        recipe: str,
+        history: Optional[list],
+        streaming: bool,
+        chef_mode: str
+    ):
+        """
+        Run the voice loop as a producer/consumer pipeline.
+        
+        One task waits for the wake word and records questions; the other answers
+        them with the LLM and TTS. Blocking audio work runs in executor threads,
+        so the next wake word is already being listened for while an answer plays;
+        saying it cuts that answer off so the recording doesn't pick it up.
+        """
+        loop = asyncio.get_running_loop()
+        # One question may wait while the previous answer is still being spoken
+        questions: asyncio.Queue = asyncio.Queue(maxsize=1)
+        wake = asyncio.Event()
+        
+        async def wait_for_wake_word() -> bool:
+            """Await the detector's signal (False if the loop is stopped first)."""
+            wake.clear()
+            # The detection thread wakes this task directly - no executor thread polls
+            wwd.arm(on_wake=lambda: loop.call_soon_threadsafe(wake.set))
+            while not wake.is_set():
+                if self.voice_loop_event.is_set():
+                    wwd.disarm()
+                    return False
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=0.25)
+                except asyncio.TimeoutError:
+                    pass
+            if wwd.last_error:
+                raise wwd.last_error
+            return True
+        
+        async def record_questions():
+            try:
+                while not self.voice_loop_event.is_set():
+                    try:
+                        # Update state - listening for wake word
+                        st.session_state.conversation_state = 'listening_for_wake_word'
+                        
+                        # Wait for wake word (returns False if stopped)
+                        if not await wait_for_wake_word():
+                            break
+                        
+                        # Wake word detected - silence any answer still playing, so
+                        # Whisper doesn't hear it, then play tone and update state
+                        self._answer_cut.set()
+                        self._stop_audio_processes()
+                        self._play_wake_word_tone()
+                        st.session_state.conversation_state = 'recording'
+                        
+                        # Record user speech, transcribing as it is spoken
+                        user_question = await loop.run_in_executor(
+                            None, stt.listen_and_transcribe, self.voice_loop_event
+                        )
+                        if not user_question.strip():
+                            continue
+                        
+                        voice_logger.info("🗣️ User asked: %s", user_question)
+                        await questions.put(user_question)
+                        
+                    except Exception as e:
+                        voice_logger.warning("⚠️ Voice loop iteration error: %s", e)
+            finally:
+                await questions.put(None)  # No more questions
+        
+        async def answer_questions():
+            while (user_question := await questions.get()) is not None:
+                # Fresh before the stop check, so a Stop after it still cuts this answer
+                self._answer_cut = cut = threading.Event()
+                if self.voice_loop_event.is_set():
+                    continue  # Stopped while this question waited; don't answer it
                 try:
-                    # Update state - listening for wake word
-                    st.session_state.conversation_state = 'listening_for_wake_word'
-                    
-                    # Wait for wake word (returns False if stopped)
-                    detected = wwd.detect_once()
-                    if not detected:
-                        break
-                    
-                    # Wake word detected - play tone and update state
-                    self._play_wake_word_tone()
-                    st.session_state.conversation_state = 'recording'
-                    
-                    # Record user speech
-                    wav_path = stt.record_until_silence()
-                    if not wav_path:
-                        continue
-                    
                     # Update state - processing
                     st.session_state.conversation_state = 'processing'
                     
-                    # Convert speech to text
-                    user_question = stt.speech_to_text(wav_path)
-                    if not user_question.strip():
-                        continue
-                    
-                    print(f"🗣️ User asked: {user_question}")
-                    
                     # Get AI response
                     if streaming:
-                        answer_text = tts.stream_and_play(
-                            llm.stream(
-                                recipe_text=(recipe if history is None else ""),
-                                user_question=user_question,
-                                history=history,
-                                chef_mode=chef_mode
-                            ),
-                            start_threshold=80
+                        agen = llm.stream(
+                            recipe_text=(recipe if history is None else ""),
+                            user_question=user_question,
+                            history=history,
+                            chef_mode=chef_mode
                         )
+                        try:
+                            answer_text = await loop.run_in_executor(
+                                None, tts.stream_and_play, iterate_async(loop, agen), 20, cut
+                            )
+                        finally:
+                            # Ends the LLM request if Stop or the wake word cut the answer short
+                            await agen.aclose()
                     else:
-                        response = llm.ask(
+                        answer_text = await llm.ask(
                             recipe_text=(recipe if history is None else ""),
                             user_question=user_question,
                             history=history,
                             chef_mode=chef_mode
                         )
                         # For non-streaming, speak the complete response at once
-                        tts.say(response)
-                        answer_text = response
+                        if not cut.is_set():
+                            await loop.run_in_executor(None, tts.say, answer_text)
                     
                     # Update history
                     if history is not None:
@@ -278,50 +657,29 @@ class ChefApp:
                     st.session_state.last_answer = answer_text
                     st.session_state.current_mode = chef_mode
                     
-                    print(f"🤖 Assistant responded: {answer_text}")
+                    voice_logger.info("🤖 Assistant responded: %s", answer_text)
+                    flush_voice_log()
                     
                 except Exception as e:
-                    print(f"⚠️ Voice loop iteration error: {e}")
-                    continue
-        
-        except Exception as e:
-            print(f"⚠️ Voice loop setup error: {e}")
-            self.voice_loop_event.set()  # Stop the loop on error
+                    voice_logger.warning("⚠️ Voice loop iteration error: %s", e)
+                finally:
+                    # Back to whatever the recorder is doing, unless it moved on already
+                    if st.session_state.conversation_state == 'processing':
+                        st.session_state.conversation_state = 'listening_for_wake_word'
         
-        finally:
-            # Cleanup
-            print("🛑 Voice loop stopped.")
-            try:
-                if 'stt' in locals():
-                    stt.cleanup()
-                if 'wwd' in locals():
-                    wwd.cleanup()
-            except:
-                pass
-
-            # Kill any playing audio processes
-            self._stop_audio_processes()
-            
-            # Update UI state
-            st.session_state.voice_loop_running = False
-            st.session_state.voice_loop_thread = None  # Clear thread reference
-            st.session_state.conversation_state = 'idle'
-            st.session_state.models_loaded = False
+        await asyncio.gather(record_questions(), answer_questions())
     
     def _stop_audio_processes(self):
         """Kill any running TTS audio processes."""
-        import subprocess
-        for proc in ["afplay", "play", "say"]:
-            try:
-                subprocess.run(["pkill", proc], check=False)
-            except Exception as e:
-                print(f"⚠️ Failed to kill audio process {proc}: {e}")
+        # One pkill for all players; -x matches whole process names only, so
+        # "play" no longer also kills unrelated processes that merely contain it
+        try:
+            subprocess.run(["pkill", "-x", "afplay|play|say"], check=False)
+        except Exception as e:
+            print(f"⚠️ Failed to kill audio processes: {e}")
     
     def _play_tone(self, tone_type: str):
         """Play a tone using macOS system sounds."""
-        import subprocess
-        import threading
-        
         def play_sound():
             try:
                 if tone_type == "ready":
@@ -357,23 +715,8 @@ class ChefApp:
             st.warning("⏳ Processing your question...")
         
         # Mode indicator
-        mode_indicators = {
-            'normal': ("😊", "Friendly Chef Mode"),
-            'sassy': ("😈", "Sassy Chef Mode"),
-            'gordon_ramsay': ("🔥", "Gordon Ramsay Mode")
-        }
-        selected_mode = st.session_state.chef_mode  
-        mode_emoji, mode_text = mode_indicators.get(selected_mode, ("😊", "Friendly Chef Mode"))
-        
-        st.markdown(
-            f"""
-            <div style="text-align: center; margin-bottom: 20px;">
-                <span style="font-size: 24px;">{mode_emoji}</span>
-                <span style="font-size: 18px; margin-left: 10px;">{mode_text}</span>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        banner = MODE_BANNERS.get(st.session_state.chef_mode, MODE_BANNERS['normal'])
+        st.markdown(banner, unsafe_allow_html=True)
         
         st.markdown(
             """
@@ -389,30 +732,50 @@ class ChefApp:
         with st.sidebar:
             st.header("⚙️ Settings")
             
-            # Model selection
-            st.subheader("🤖 AI Model")
-            selected_model = st.selectbox(
-                "Choose GPT Model",
-                options=self.settings.llm.available_models,
-                index=self.settings.llm.available_models.index(self.settings.llm.model),
-                help="Select which OpenAI model to use"
-            )
-            
-            st.divider()
-            
-            # Mode selection
-            st.subheader("🎭 Chef Personality")
-            chef_mode = st.radio(
-                "Choose your chef personality:",
-                options=["normal", "sassy", "gordon_ramsay"],
-                format_func=lambda x: {
-                    "normal": "😊 Friendly Chef - Helpful and encouraging",
-                    "sassy": "😈 Sassy Chef - Brutally honest with attitude",
-                    "gordon_ramsay": "🔥 Gordon Ramsay - Explosive Hell's Kitchen mode"
-                }[x],
-                index=0 if not hasattr(st.session_state, 'chef_mode') else ["normal", "sassy", "gordon_ramsay"].index(st.session_state.chef_mode),
-                help="Select the chef personality for your cooking assistant"
-            )
+            # Controls live in a form so changing several of them costs one rerun, on Apply
+            with st.form("ctrl"):
+                # Model selection
+                st.subheader("🤖 AI Model")
+                selected_model = st.selectbox(
+                    "Choose GPT Model",
+                    options=self.settings.llm.available_models,
+                    index=self.settings.llm.available_models.index(self.settings.llm.model),
+                    help="Select which OpenAI model to use"
+                )
+                
+                st.divider()
+                
+                # Mode selection
+                st.subheader("🎭 Chef Personality")
+                chef_mode = st.radio(
+                    "Choose your chef personality:",
+                    options=["normal", "sassy", "gordon_ramsay"],
+                    format_func=lambda x: {
+                        "normal": "😊 Friendly Chef - Helpful and encouraging",
+                        "sassy": "😈 Sassy Chef - Brutally honest with attitude",
+                        "gordon_ramsay": "🔥 Gordon Ramsay - Explosive Hell's Kitchen mode"
+                    }[x],
+                    index=0 if not hasattr(st.session_state, 'chef_mode') else ["normal", "sassy", "gordon_ramsay"].index(st.session_state.chef_mode),
+                    help="Select the chef personality for your cooking assistant"
+                )
+                
+                st.divider()
+                
+                # Audio settings
+                st.subheader("🔊 Audio Options")
+                use_history = st.checkbox(
+                    "Maintain conversation history",
+                    value=self.settings.ui.default_use_history,
+                    help="Keep track of the conversation for context"
+                )
+                
+                use_streaming = st.checkbox(
+                    "Enable streaming responses",
+                    value=self.settings.ui.default_use_streaming,
+                    help="Start speaking as soon as AI begins responding"
+                )
+                
+                st.form_submit_button("Apply")
             
             # Update session state
             st.session_state.chef_mode = chef_mode
@@ -423,20 +786,16 @@ class ChefApp:
             elif chef_mode == "gordon_ramsay":
                 st.error("🔥 WARNING: Gordon Ramsay mode! Prepare for explosive, demanding responses!")
             
-            st.divider()
-            
-            # Audio settings
-            st.subheader("🔊 Audio Options")
-            use_history = st.checkbox(
-                "Maintain conversation history",
-                value=self.settings.ui.default_use_history,
-                help="Keep track of the conversation for context"
-            )
-            
-            use_streaming = st.checkbox(
-                "Enable streaming responses",
-                value=self.settings.ui.default_use_streaming,
-                help="Start speaking as soon as AI begins responding"
+            # Notion recipes are cached for RECIPE_CACHE_TTL_SEC; refetch on demand
+            if st.button("🔄 Refresh recipes", help="Fetch the latest recipes from Notion"):
+                fetch_recipes.clear()
+                fetch_recipe_details.clear()
+                clear_prefetched()
+                format_notion_recipe_cached.clear()
+            st.checkbox(
+                "Prefetch all recipes",
+                key="prefetch_recipes",
+                help="Load every Notion recipe up front so switching between them is instant"
             )
             
             st.divider()
@@ -447,11 +806,9 @@ class ChefApp:
             # Show stop button when running
             if st.session_state.voice_loop_running:
                 if st.button("🛑 Stop Listening", type="secondary"):
-                    self.voice_loop_event.set()  # Signal thread to stop
-                    if self.voice_loop_thread and self.voice_loop_thread.is_alive():
-                        self.voice_loop_thread.join(timeout=2)  # Wait for thread to finish
+                    self._request_stop()
                     self._stop_audio_processes()  # Kill any playing audio
-                    st.session_state.voice_loop_thread = None  # Clear thread reference
+                    self.voice_loop_idle.wait(timeout=2)  # Wait for the loop to finish
                     st.session_state.voice_loop_running = False
                     st.session_state.conversation_state = 'idle'
                     st.session_state.models_loaded = False
@@ -460,8 +817,18 @@ class ChefApp:
             # Always return False for sidebar start; starting handled on main page
             return selected_model, chef_mode, use_history, use_streaming, False
     
-    def _render_recipe_section(self) -> str:
-        """Render the recipe selection section."""
+    @st.fragment
+    def _render_recipe_section(self):
+        """
+        Render the recipe selection as a fragment, storing the choice in current_recipe.
+        
+        Switching source or recipe reruns only this section, not the sidebar,
+        header and controls around it.
+        """
+        st.session_state.current_recipe = self._select_recipe()
+    
+    def _select_recipe(self) -> str:
+        """Render the recipe selection widgets and return the chosen recipe text."""
         st.subheader("📝 Recipe Selection")
         
         col1, col2 = st.columns([5, 1])
@@ -479,7 +846,8 @@ class ChefApp:
                     "Notion DB": "🗂️ Notion DB",
                     "Custom": "✏️ Custom"
                 }[x],
-                horizontal=True
+                horizontal=True,
+                key="recipe_source"
             )
             st.session_state.selected_source = source
 
@@ -497,6 +865,8 @@ class ChefApp:
                 st.write("Fetching recipes from Notion...")
                 try:
                     recipes = fetch_recipes()
+                    if st.session_state.prefetch_recipes:
+                        prefetch_recipe_details([r.get("id") for r in recipes])
                     # Extract recipe names from title property for each recipe
                     options = []
                     for r in recipes:
@@ -507,18 +877,27 @@ class ChefApp:
                             if prop.get("type") == "title":
                                 title_prop = prop
                                 break
-                        if title_prop and title_prop.get("title"):
-                            name = next((t.get("plain_text") for t in title_prop["title"] if t.get("plain_text")), "<Unnamed>")
-                        else:
-                            name = "<Unnamed>"
-                        options.append(name)
+                        # All text runs, as in format_notion_recipe
+                        name = _plain_text(title_prop.get("title")) if title_prop else ""
+                        options.append(name or "<Unnamed>")
                     # Persist selected Notion recipe choice index
                     default_notion_index = st.session_state.selected_notion_choice_index if 0 <= st.session_state.selected_notion_choice_index < len(options) else 0
-                    choice = st.selectbox("Select a recipe", options, index=default_notion_index)
-                    st.session_state.selected_notion_choice_index = options.index(choice)
-                    selected = next(r for r, name in zip(recipes, options) if name == choice)
+                    # Select by position, so recipes sharing a name stay distinct
+                    choice_index = st.selectbox(
+                        "Select a recipe",
+                        range(len(options)),
+                        index=default_notion_index,
+                        format_func=options.__getitem__,
+                        key="recipe_choice"
+                    )
+                    st.session_state.selected_notion_choice_index = choice_index
+                    selected = recipes[choice_index]
                     details = fetch_recipe_details(selected.get("id"))
-                    content_md = format_notion_recipe(details)
+                    last_edited = details.get("last_edited_time")
+                    if last_edited:
+                        content_md = format_notion_recipe_cached(selected.get("id"), last_edited, details)
+                    else:
+                        content_md = format_notion_recipe(details)
                     with st.expander("👀 View selected recipe"):
                         st.markdown(content_md)
                     return content_md
@@ -562,54 +941,48 @@ class ChefApp:
         if st.session_state.last_answer:
             st.subheader("💬 Last Response")
             
-            # Style based on mode
-            mode_styles = {
-                'normal': {
-                    'bg_color': '#F0F8FF',
-                    'border_color': '#4CAF50',
-                    'title': 'Chef Bot says:',
-                    'style': 'normal'
-                },
-                'sassy': {
-                    'bg_color': '#FFE4E1',
-                    'border_color': '#FF6B6B',
-                    'title': 'Chef Sass says:',
-                    'style': 'italic'
-                },
-                'gordon_ramsay': {
-                    'bg_color': '#FFF5EE',
-                    'border_color': '#FF4500',
-                    'title': 'CHEF RAMSAY SHOUTS:',
-                    'style': 'bold'
-                }
-            }
-            
-            current_style = mode_styles.get(st.session_state.current_mode, mode_styles['normal'])
-            
-            # Format the message based on style
-            if current_style['style'] == 'italic':
-                message_format = f'<em>"{st.session_state.last_answer}"</em>'
-            elif current_style['style'] == 'bold':
-                message_format = f'<strong>"{st.session_state.last_answer}"</strong>'
-            else:
-                message_format = f'"{st.session_state.last_answer}"'
-            
-            st.markdown(
-                f"""
-                <div style="background-color: {current_style['bg_color']}; padding: 15px; border-radius: 10px; border-left: 4px solid {current_style['border_color']};">
-                    <strong>{current_style['title']}</strong><br>
-                    {message_format}
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+            # Style comes from the chef-<mode> class in CHEF_CSS
+            card = RESPONSE_CARDS.get(st.session_state.current_mode, RESPONSE_CARDS['normal'])
+            # Escaped: the answer is model output going into raw HTML
+            answer = html.escape(st.session_state.last_answer)
+            st.markdown(card.safe_substitute(answer=answer), unsafe_allow_html=True)
             
             if st.button("🗑️ Clear Response"):
                 st.session_state.last_answer = ""
                 st.rerun()
     
+    def _render_live_response(self):
+        """
+        Show the last response, refreshing just this fragment while the voice loop runs.
+        
+        A change in conversation state still reruns the whole app so the header
+        and control buttons follow along.
+        """
+        if not st.session_state.voice_loop_running:
+            self._render_last_response()
+            return
+        
+        busy = st.session_state.conversation_state in ('recording', 'processing')
+        st.fragment(run_every=LIVE_REFRESH_BUSY_SEC if busy else LIVE_REFRESH_SEC)(self._poll_voice_loop)()
+    
+    def _poll_voice_loop(self):
+        """Fragment body: rerun the app on a state change, else redraw the response."""
+        voice_state = (st.session_state.voice_loop_running, st.session_state.conversation_state)
+        if voice_state != st.session_state.rendered_voice_state:
+            st.rerun()
+        self._render_last_response()
+    
     def run(self):
         """Main application entry point."""
+        # Page config and CSS belong to each run; settings follow config.yaml edits
+        self._setup_page()
+        self.settings = current_settings()
+        
+        # Remember what this run renders so the live fragment can spot changes
+        st.session_state.rendered_voice_state = (
+            st.session_state.voice_loop_running, st.session_state.conversation_state
+        )
+        
         # Sidebar controls (update mode; no start here)
         selected_model, chef_mode, use_history, use_streaming, _ = self._render_sidebar()
 
@@ -642,11 +1015,9 @@ class ChefApp:
                 
         # Handle stop action immediately
         if stop_requested:
-            self.voice_loop_event.set()
-            if self.voice_loop_thread and self.voice_loop_thread.is_alive():
-                self.voice_loop_thread.join(timeout=2)
+            self._request_stop()
             self._stop_audio_processes()
-            st.session_state.voice_loop_thread = None  # Clear thread reference
+            self.voice_loop_idle.wait(timeout=2)
             st.session_state.voice_loop_running = False
             st.session_state.conversation_state = 'idle'
             st.session_state.models_loaded = False
@@ -657,47 +1028,48 @@ class ChefApp:
         if st.session_state.voice_loop_running:
             recipe = st.session_state.selected_recipe
         else:
-            recipe = self._render_recipe_section()
+            self._render_recipe_section()
+            recipe = st.session_state.current_recipe
         
         # Handle voice loop start
         if should_start:
             if not recipe.strip():
                 st.error("❌ Please select or enter a recipe before starting.")
+            elif get_voice_loop_lock().locked() and self.voice_loop_idle.is_set():
+                # Held while this session is idle, so another session's loop has the microphone
+                st.error("❌ Voice assistant is already running in another session.")
             else:
                 # Cache selected recipe to avoid re-fetch on reruns
                 st.session_state.selected_recipe = recipe
                 st.session_state.voice_loop_running = True
                 st.session_state.conversation_state = 'idle'  # Will change to listening_for_wake_word once models load
                 st.session_state.models_loaded = False
-                self.voice_loop_event.clear()  # Clear the stop event
                 
-                # Start voice loop in background thread
-                self.voice_loop_thread = threading.Thread(
-                    target=self._start_voice_loop,
-                    args=(recipe, use_history, use_streaming, chef_mode, selected_model),
-                    daemon=True
-                )
-                self.voice_loop_thread.start()
-                st.session_state.voice_loop_thread = self.voice_loop_thread  # Persist thread
+                # Hand the loop to this session's worker thread; the worker clears
+                # the stop event itself, so a loop still shutting down stays stopped
+                self._request_voice_loop(recipe, use_history, use_streaming, chef_mode, selected_model)
                 
                 st.success("🔊 Voice assistant started! Say 'Hey Chef' and ask your question.")
                 st.rerun()
         
-        # Display last response
-        self._render_last_response()
-        
-        # Auto-refresh to show responses (only if voice loop is running)
-        if st.session_state.voice_loop_running:
-            import time
-            time.sleep(1)  # Slightly longer sleep to reduce CPU usage
-            st.rerun()
+        # Display last response (polls in a fragment while the voice loop runs)
+        self._render_live_response()
 
 
 def main():
     """Entry point for the Streamlit app."""
-    app = ChefApp()
+    app = _get_app()
     app.run()
 
 
+def _get_app() -> ChefApp:
+    """Get this browser session's app, building it on the first run only."""
+    # Held in session state rather than st.cache_resource: the voice loop's
+    # stop event and thread belong to one session and must not be shared
+    if 'chef_app' not in st.session_state:
+        st.session_state.chef_app = ChefApp()
+    return st.session_state.chef_app
+
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file